@@ -3,12 +3,14 @@ Analytics API Routes
 Provides comprehensive domain analytics with AI-powered insights
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import Literal, Optional
 import logging
 
-from app.services.analytics import AnalyticsService
+from app.services.analytics import AnalyticsService, to_columnar
+from app.utils.helpers import format_sse
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -26,14 +28,20 @@ class QuickMetricsRequest(BaseModel):
 
 
 @router.post("/full")
-async def get_full_analytics(request: AnalyticsRequest):
+async def get_full_analytics(
+    request: AnalyticsRequest,
+    layout: Literal["rows", "columns"] = Query("rows")
+):
     """
     Get comprehensive analytics for a domain.
     Orchestrates all agents: SEO Auditor, AI Visibility, Competitor Intel, Keyword Engine
-    Returns structured data optimized for dashboard charts
+    Returns structured data optimized for dashboard charts.
+    layout=columns returns the chart series as parallel arrays instead of row objects.
     """
     try:
         result = await analytics_service.get_domain_analytics(request.domain)
+        if layout == "columns":
+            result = to_columnar(result)
         return {
             "success": True,
             "data": result
@@ -43,6 +51,24 @@ async def get_full_analytics(request: AnalyticsRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/stream")
+async def stream_full_analytics(request: AnalyticsRequest):
+    """
+    Server-sent events version of /full.
+    Emits the chart data as an `analytics` event first, then each AI insight
+    section as an `insight` event while the LLM is still generating, then `done`.
+    """
+    async def event_source():
+        try:
+            async for event in analytics_service.stream_domain_analytics(request.domain):
+                yield format_sse(event["event"], event["data"])
+        except Exception as e:
+            logger.error(f"Analytics stream failed for {request.domain}: {e}")
+            yield format_sse("error", {"detail": str(e)})
+
+    return StreamingResponse(event_source(), media_type="text/event-stream")
+
+
 @router.post("/quick")
 async def get_quick_metrics(request: QuickMetricsRequest):
     """
@@ -66,6 +92,18 @@ async def get_quick_metrics(request: QuickMetricsRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/flush")
+async def flush_analytics_cache(request: AnalyticsRequest):
+    """
+    Invalidate cached analytics for a domain so the next request recomputes it
+    """
+    flushed = analytics_service.flush_domain(request.domain)
+    return {
+        "success": True,
+        "data": {"domain": request.domain, "flushed": flushed}
+    }
+
+
 @router.get("/health")
 async def analytics_health():
     """Health check for analytics service"""
@@ -2,8 +2,7 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List, Optional
 from app.services.rag_engine import rag_engine
-from openai import AsyncOpenAI
-from app.core.config import settings
+from app.core.openai_client import get_openai_client
 import logging
 
 router = APIRouter(tags=["🤖 Chat Assistant"])
@@ -72,7 +71,9 @@ async def chat_with_assistant(request: ChatRequest):
         - Maintain a "Strategic Advisor" tone.
         """
 
-        client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        client = get_openai_client()
+        if client is None:
+            raise RuntimeError("OPENAI_API_KEY is not configured")
         
         try:
             # Try GPT-4o first as requested
@@ -3,10 +3,12 @@ Competitive Intelligence API Routes
 """
 
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List
+from typing import AsyncIterator, List, Tuple, Any
 
 from app.services.competitive_intel import competitive_intel_service
+from app.utils.helpers import format_sse
 
 router = APIRouter()
 
@@ -25,6 +27,11 @@ class ContentGapRequest(BaseModel):
     competitor_domains: List[str]
 
 
+class FullAnalysisRequest(BaseModel):
+    domain: str
+    competitors: List[str]
+
+
 class TrafficRequest(BaseModel):
     domain: str
 
@@ -40,6 +47,13 @@ async def analyze_competitor(request: CompetitorAnalysisRequest):
     return {"success": True, "data": result}
 
 
+@router.post("/full")
+async def analyze_full(request: FullAnalysisRequest):
+    """Competitor analysis, comparison, content gaps, traffic and backlinks in one call"""
+    result = await competitive_intel_service.analyze_full(request.domain, request.competitors)
+    return {"success": True, "data": result}
+
+
 @router.post("/compare")
 async def compare_domains(request: CompareDomainsRequest):
     """Compare your domain with competitors"""
@@ -58,6 +72,27 @@ async def find_content_gaps(request: ContentGapRequest):
     return {"success": True, "data": result}
 
 
+async def _section_events(sections: AsyncIterator[Tuple[str, Any]]):
+    """Turn (section, value) pairs into SSE `section` events followed by `done`"""
+    async for key, value in sections:
+        yield format_sse("section", {key: value})
+    yield format_sse("done", {})
+
+
+@router.post("/compare/stream")
+async def stream_compare_domains(request: CompareDomainsRequest):
+    """Server-sent events version of /compare: each result section is sent as soon as it is generated"""
+    sections = competitive_intel_service.stream_compare_domains(request.your_domain, request.competitors)
+    return StreamingResponse(_section_events(sections), media_type="text/event-stream")
+
+
+@router.post("/content-gaps/stream")
+async def stream_content_gaps(request: ContentGapRequest):
+    """Server-sent events version of /content-gaps: each result section is sent as soon as it is generated"""
+    sections = competitive_intel_service.stream_content_gaps(request.your_domain, request.competitor_domains)
+    return StreamingResponse(_section_events(sections), media_type="text/event-stream")
+
+
 @router.post("/traffic")
 async def estimate_traffic(request: TrafficRequest):
     """Estimate domain traffic"""
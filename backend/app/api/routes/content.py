@@ -2,11 +2,13 @@
 Content Intelligence API Routes
 """
 
-from fastapi import APIRouter
-from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import AsyncIterator, List, Literal, Optional, Dict, Any, Tuple
 
-from app.services.content_engine import content_engine_service
+from app.services.content_engine import BULK_MAX_ITEMS, ContentEngineService, content_engine_service
+from app.utils.helpers import format_sse
 
 router = APIRouter()
 
@@ -17,6 +19,12 @@ class ContentBriefRequest(BaseModel):
     content_type: str = "blog_post"
 
 
+class BriefBundleRequest(BaseModel):
+    topic: str
+    target_keyword: str
+    idea_count: int = 10
+
+
 class ContentCreateRequest(BaseModel):
     topic: str
     keyword: str
@@ -59,70 +67,121 @@ class SummarizeRequest(BaseModel):
     length: str = "medium"
 
 
+class BulkRequest(BaseModel):
+    kind: Literal["brief", "titles", "meta", "outline", "ideas"]
+    items: List[Dict[str, Any]] = Field(..., max_length=BULK_MAX_ITEMS)
+
+
+def get_content_engine() -> ContentEngineService:
+    """Content engine dependency; override in app.dependency_overrides to inject another client"""
+    return content_engine_service
+
+
+async def _sse_events(events: AsyncIterator[Tuple[str, Dict[str, Any]]]):
+    """Encode (event, data) pairs from a streaming service method as server-sent events"""
+    async for event, data in events:
+        yield format_sse(event, data)
+
+
 @router.post("/brief")
-async def generate_content_brief(request: ContentBriefRequest):
+async def generate_content_brief(request: ContentBriefRequest, engine: ContentEngineService = Depends(get_content_engine)):
     """Generate comprehensive content brief"""
-    result = await content_engine_service.generate_content_brief(
+    result = await engine.generate_content_brief(
         request.topic, request.target_keyword, request.content_type
     )
     return {"success": True, "data": result}
 
 
+@router.post("/bundle")
+async def generate_brief_bundle(request: BriefBundleRequest, engine: ContentEngineService = Depends(get_content_engine)):
+    """Generate brief, outline and article ideas for a topic in one call"""
+    result = await engine.generate_brief_bundle(request.topic, request.target_keyword, request.idea_count)
+    return {"success": True, "data": result}
+
+
 @router.post("/create")
-async def create_content(request: ContentCreateRequest):
+async def create_content(request: ContentCreateRequest, engine: ContentEngineService = Depends(get_content_engine)):
     """Generate full content article"""
-    result = await content_engine_service.create_content(
+    result = await engine.create_content(
         request.topic, request.keyword, request.word_count
     )
     return {"success": True, "data": result}
 
 
+@router.post("/create/stream")
+async def stream_create_content(request: ContentCreateRequest, engine: ContentEngineService = Depends(get_content_engine)):
+    """Server-sent events version of /create: the article is sent as it is written"""
+    events = engine.stream_create_content(request.topic, request.keyword, request.word_count)
+    return StreamingResponse(_sse_events(events), media_type="text/event-stream")
+
+
 @router.post("/titles")
-async def generate_titles(request: TitleRequest):
+async def generate_titles(request: TitleRequest, engine: ContentEngineService = Depends(get_content_engine)):
     """Generate SEO-optimized title tags"""
-    result = await content_engine_service.generate_titles(request.keyword, request.count)
+    result = await engine.generate_titles(request.keyword, request.count)
     return {"success": True, "data": result}
 
 
 @router.post("/meta")
-async def generate_meta_descriptions(request: MetaRequest):
+async def generate_meta_descriptions(request: MetaRequest, engine: ContentEngineService = Depends(get_content_engine)):
     """Generate meta descriptions"""
-    result = await content_engine_service.generate_meta_descriptions(
+    result = await engine.generate_meta_descriptions(
         request.keyword, request.context, request.count
     )
     return {"success": True, "data": result}
 
 
 @router.post("/outline")
-async def create_outline(request: OutlineRequest):
+async def create_outline(request: OutlineRequest, engine: ContentEngineService = Depends(get_content_engine)):
     """Create content outline"""
-    result = await content_engine_service.create_outline(request.topic, request.keyword)
+    result = await engine.create_outline(request.topic, request.keyword)
     return {"success": True, "data": result}
 
 
 @router.post("/schema")
-async def generate_schema(request: SchemaRequest):
+async def generate_schema(request: SchemaRequest, engine: ContentEngineService = Depends(get_content_engine)):
     """Generate JSON-LD schema markup"""
-    result = await content_engine_service.generate_schema(request.schema_type, request.data)
+    result = await engine.generate_schema(request.schema_type, request.data)
     return {"success": True, "data": result}
 
 
 @router.post("/rewrite")
-async def rewrite_content(request: RewriteRequest):
+async def rewrite_content(request: RewriteRequest, engine: ContentEngineService = Depends(get_content_engine)):
     """Rewrite content with specified style"""
-    result = await content_engine_service.rewrite_content(request.text, request.style)
+    result = await engine.rewrite_content(request.text, request.style)
     return {"success": True, "data": result}
 
 
+@router.post("/rewrite/stream")
+async def stream_rewrite_content(request: RewriteRequest, engine: ContentEngineService = Depends(get_content_engine)):
+    """Server-sent events version of /rewrite"""
+    events = engine.stream_rewrite_content(request.text, request.style)
+    return StreamingResponse(_sse_events(events), media_type="text/event-stream")
+
+
 @router.post("/ideas")
-async def generate_ideas(request: IdeasRequest):
+async def generate_ideas(request: IdeasRequest, engine: ContentEngineService = Depends(get_content_engine)):
     """Generate article ideas for a topic"""
-    result = await content_engine_service.generate_ideas(request.topic, request.count)
+    result = await engine.generate_ideas(request.topic, request.count)
     return {"success": True, "data": result}
 
 
 @router.post("/summarize")
-async def summarize_content(request: SummarizeRequest):
+async def summarize_content(request: SummarizeRequest, engine: ContentEngineService = Depends(get_content_engine)):
     """Summarize content"""
-    result = await content_engine_service.summarize_content(request.content, request.length)
+    result = await engine.summarize_content(request.content, request.length)
+    return {"success": True, "data": result}
+
+
+@router.post("/summarize/stream")
+async def stream_summarize_content(request: SummarizeRequest, engine: ContentEngineService = Depends(get_content_engine)):
+    """Server-sent events version of /summarize"""
+    events = engine.stream_summarize_content(request.content, request.length)
+    return StreamingResponse(_sse_events(events), media_type="text/event-stream")
+
+
+@router.post("/bulk")
+async def bulk_generate(request: BulkRequest, engine: ContentEngineService = Depends(get_content_engine)):
+    """Run many brief/titles/meta/outline/ideas requests concurrently"""
+    result = await engine.bulk_generate(request.kind, request.items)
     return {"success": True, "data": result}
@@ -31,7 +31,12 @@ class Settings(BaseSettings):
     # OpenAI Configuration
     OPENAI_API_KEY: Optional[str] = None
     OPENAI_MODEL: str = "gpt-4o-mini"
+    OPENAI_MODEL_FAST: Optional[str] = None  # short structured outputs (titles, meta, summaries)
+    OPENAI_MODEL_SMART: Optional[str] = None  # long-form writing (briefs, articles); both default to OPENAI_MODEL
     OPENAI_MAX_TOKENS: int = 4000
+    OPENAI_MAX_RPM: int = 500  # account rate limits used to throttle bulk generation
+    OPENAI_MAX_TPM: int = 200000
+    HEDGE_AFTER_SECONDS: float = 10.0  # duplicate a slow interactive completion after this long
     
     # Firecrawl Configuration
     FIRECRAWL_API_KEY: Optional[str] = None
@@ -57,6 +62,9 @@ class Settings(BaseSettings):
     
     # Caching
     CACHE_TTL_SECONDS: int = 3600  # 1 hour
+    ANALYTICS_CACHE_TTL_SECONDS: int = 900  # 15 minutes
+    CONTENT_CACHE_TTL_SECONDS: int = 86400  # 24 hours
+    REDIS_URL: Optional[str] = None  # shared external API cache (needs redis); in-process if unset
 
 
 # Global settings instance
@@ -0,0 +1,85 @@
+"""
+OpenAI Client
+Process-wide AsyncOpenAI client backed by a pooled httpx transport
+"""
+
+from importlib.util import find_spec
+from typing import Optional
+import asyncio
+import functools
+import logging
+import random
+
+import httpx
+import openai
+from openai import AsyncOpenAI
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Global OpenAI client, shared by every OpenAI-backed service
+_openai_client: Optional[AsyncOpenAI] = None
+
+# Transient failures worth retrying: 429s, 5xx, timeouts and dropped connections
+RETRYABLE_OPENAI_ERRORS = (openai.RateLimitError, openai.InternalServerError, openai.APIConnectionError)
+
+
+def get_openai_client() -> Optional[AsyncOpenAI]:
+    """Get or create the shared OpenAI client (None if no API key is configured)"""
+    global _openai_client
+
+    if _openai_client is None and settings.OPENAI_API_KEY:
+        # HTTP/2 lets concurrent completions multiplex over one connection;
+        # it needs the optional h2 package (httpx[http2])
+        http2 = find_spec("h2") is not None
+        http_client = httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60),
+            timeout=httpx.Timeout(30.0, connect=5.0)
+        )
+        _openai_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY, http_client=http_client)
+        logger.info(f"✅ OpenAI client initialized (http2={http2})")
+
+    return _openai_client
+
+
+async def close_openai_client():
+    """Close the shared OpenAI client and its connection pool"""
+    global _openai_client
+
+    if _openai_client is not None:
+        await _openai_client.close()
+        _openai_client = None
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds from a Retry-After header on the error's response, if any"""
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return min(float(value), 60.0) if value else None
+    except ValueError:
+        return None
+
+
+def retry_openai(max_attempts: int = 3, base: float = 0.5, max_delay: float = 8.0):
+    """
+    Retry an async OpenAI call on transient errors with jittered exponential
+    backoff, honouring Retry-After when the API sends one. The last error is
+    re-raised once attempts are exhausted.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            for attempt in range(1, max_attempts + 1):
+                try:
+                    return await func(*args, **kwargs)
+                except RETRYABLE_OPENAI_ERRORS as e:
+                    if attempt == max_attempts:
+                        raise
+                    delay = _retry_after(e) or min(max_delay, base + random.uniform(0, base * 2 ** attempt))
+                    logger.warning(f"OpenAI call failed ({type(e).__name__}), retry {attempt}/{max_attempts - 1} in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+        return wrapper
+    return decorator
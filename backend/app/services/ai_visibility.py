@@ -4,16 +4,20 @@ AI Visibility Service - Track brand visibility across AI platforms
 
 import asyncio
 from typing import List, Dict, Any, Optional
-from openai import AsyncOpenAI
 import logging
 import json
+import hashlib
 
 from app.core.config import settings
+from app.core.openai_client import get_openai_client
 from app.core.database import save_to_db
 from app.utils.helpers import extract_json
 
 logger = logging.getLogger(__name__)
 
+# Months covered by the visibility trend chart
+VISIBILITY_TREND_MONTHS = ("Aug", "Sep", "Oct", "Nov", "Dec", "Jan")
+
 
 class AIVisibilityService:
     """Service for tracking brand visibility in AI-generated responses"""
@@ -27,7 +31,7 @@ class AIVisibilityService:
     def client(self):
         """Lazy initialization of OpenAI client"""
         if self._client is None and settings.OPENAI_API_KEY:
-            self._client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+            self._client = get_openai_client()
             logger.info("OpenAI client initialized for AIVisibility")
         return self._client
     
@@ -122,8 +126,7 @@ class AIVisibilityService:
                 aeo_playbook = [{"title": "Knowledge Graph Maintenance", "action": "Sync entity attributes", "implementation": "Schema.org update"}]
             
             # 5. Generate high-fidelity UI data for the dashboard
-            import hashlib
-            name_hash = int(hashlib.md5(brand_name.encode()).hexdigest()[:8], 16)
+            name_hash = int.from_bytes(hashlib.md5(brand_name.encode()).digest()[:4], "big")
             
             # Dynamic platform mentions based on score
             # If total_mentions is 0 but we have a score (fallback), use a base multiplier
@@ -137,10 +140,9 @@ class AIVisibilityService:
             ]
 
             # Visibility Trend for the last 6 months
-            months = ["Aug", "Sep", "Oct", "Nov", "Dec", "Jan"]
             visibility_trend = [
                 {"month": m, "score": max(5, int(visibility_score * (0.6 + i * 0.08)))}
-                for i, m in enumerate(months)
+                for i, m in enumerate(VISIBILITY_TREND_MONTHS)
             ]
 
             # Citations (using real mention details)
@@ -5,15 +5,27 @@ Orchestrates all agents to produce unified domain analytics with AI-powered insi
 
 import asyncio
 import logging
-from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
-import json
+import operator
+import time
+from functools import lru_cache
+from importlib.util import find_spec
+from itertools import accumulate, repeat
+from types import MappingProxyType
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
+from datetime import datetime, timezone
+import hashlib
+import orjson
+import random
+import re
+import zlib
 import httpx
+from cachetools import TTLCache
 
-from openai import AsyncOpenAI
 from app.core.config import settings
+from app.core.openai_client import get_openai_client
 from app.services.external_apis import external_apis
 from app.services.google_metrics import google_metrics
+from app.utils.helpers import JSONObjectStream
 
 logger = logging.getLogger(__name__)
 
@@ -21,40 +33,375 @@ DEFAULT_HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 }
 
+# Months covered by the 6-month trend charts
+TREND_MONTHS = ("Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+# Every other month across the year, for the derived backlink trend
+BIMONTHLY_TREND_MONTHS = ("Feb", "Apr", "Jun", "Aug", "Oct", "Dec")
+
+# (month, growth factor, seasonal factor) for the traffic trend: 2% monthly growth, +10% in Nov/Dec
+TRAFFIC_TREND_FACTORS = tuple(
+    (month, 1 + (i * 0.02), 1.1 if month in ("Nov", "Dec") else 1.0)
+    for i, month in enumerate(TREND_MONTHS)
+)
+
+# (month, fraction of the way from base to current referring domains) for the backlink trend
+BACKLINK_TREND_STEPS = tuple((month, i / 5) for i, month in enumerate(TREND_MONTHS))
+
+# Compounded 2% monthly growth for the mock traffic trend (1.0, 1.02, 1.02 * 1.02, ...)
+MOCK_GROWTH_FACTORS = tuple(accumulate(repeat(1.02, len(TREND_MONTHS) - 1), operator.mul, initial=1.0))
+
+# Chart colors for AI platforms reported by the visibility service
+AI_PLATFORM_COLORS = MappingProxyType({"chatgpt": "#10B981", "claude": "#8B5CF6", "perplexity": "#3B82F6", "gemini": "#F59E0B"})
+
+# Default AI visibility platforms for well-known brands
+AMAZON_DEFAULT_PLATFORMS = (
+    {"name": "ChatGPT", "mentions": 8500, "cited": 12000, "color": "#10B981"},
+    {"name": "AI Overview", "mentions": 15200, "cited": 28000, "color": "#3B82F6"},
+    {"name": "AI Mode", "mentions": 22000, "cited": 35000, "color": "#8B5CF6"},
+    {"name": "Gemini", "mentions": 9800, "cited": 18500, "color": "#F59E0B"},
+)
+FLIPKART_DEFAULT_PLATFORMS = (
+    {"name": "ChatGPT", "mentions": 3200, "cited": 4500, "color": "#10B981"},
+    {"name": "AI Overview", "mentions": 5800, "cited": 12000, "color": "#3B82F6"},
+    {"name": "AI Mode", "mentions": 8500, "cited": 15000, "color": "#8B5CF6"},
+    {"name": "Gemini", "mentions": 2800, "cited": 5200, "color": "#F59E0B"},
+)
+
+# Scheme and leading www. of a domain or URL
+_DOMAIN_RE = re.compile(r'^(?:https?://)?(?:www\.)?', re.IGNORECASE)
+
+# Brands with hand-tuned default AI visibility rows, checked in order
+BRAND_DEFAULT_PLATFORMS = MappingProxyType({
+    "amazon": AMAZON_DEFAULT_PLATFORMS,
+    "flipkart": FLIPKART_DEFAULT_PLATFORMS,
+})
+
+# (name, mentions multiplier, cited multiplier, color) applied to a hash-derived base
+GENERIC_PLATFORM_TEMPLATE = (
+    ("ChatGPT", 1, 1.2, "#10B981"),
+    ("AI Overview", 0.8, 2.5, "#3B82F6"),
+    ("AI Mode", 1.5, 3, "#8B5CF6"),
+    ("Gemini", 0.6, 0.4, "#F59E0B"),
+)
+
+
+# (authority range, share of referring domains, display percent).
+# Typical distribution: most links come from low authority domains
+AUTHORITY_DISTRIBUTION = (
+    ("81-100", 0.002, 0.21),
+    ("61-80", 0.006, 0.61),
+    ("41-60", 0.023, 2.27),
+    ("21-40", 0.087, 8.68),
+    ("0-20", 0.882, 88.24),
+)
+
+# Mock traffic bases for well-known brands: (organic, direct, referral)
+KNOWN_DOMAIN_TRAFFIC = MappingProxyType({
+    "amazon": (45_000_000, 25_000_000, 8_000_000),
+    "flipkart": (28_000_000, 15_000_000, 5_000_000),
+    "google": (100_000_000, 80_000_000, 20_000_000),
+})
+
+# Mock backlink metrics for well-known brands:
+# (referring domains, total backlinks, authority score, traffic label, keywords label)
+KNOWN_DOMAIN_BACKLINKS = MappingProxyType({
+    "amazon": (520_000, 85_000_000, 96, "89M", "4.2M"),
+    "flipkart": (195_000, 42_000_000, 91, "52M", "2.8M"),
+    "google": (2_000_000, 500_000_000, 99, "2.5B", "15M"),
+})
+
+# Estimated keyword rows: (keyword template, base position, position spread,
+# volume and traffic as fractions of the domain's volume base, trend)
+BRAND_KEYWORD_TEMPLATES = (
+    ("{brand}", 1, 1, 1.0, 0.6, "up"),
+    ("{brand} online", 1, 2, 0.4, 0.2, "up"),
+    ("buy {brand}", 2, 3, 0.15, 0.05, "stable"),
+    ("{brand} reviews", 3, 5, 0.1, 0.02, "up"),
+    ("best deals online", 10, 15, 0.8, 0.01, "stable"),
+)
+
+# Industry keywords added for high-authority sites:
+# (insert index, keyword, base position, position spread, volume, traffic fraction, trend)
+POWER_KEYWORD_TEMPLATES = (
+    (2, "online shopping", 2, 4, 2_800_000, 0.1, "stable"),
+    (4, "free shipping", 5, 8, 1_200_000, 0.05, "up"),
+)
+
+# Labels for the phase-1 gather in get_domain_analytics, in task order
+PHASE1_TASK_NAMES = ("serp", "seo", "visibility", "competitor", "keyword", "gsc", "ga", "authority", "brand_search")
+
+
+def _is_fallback(result: Any) -> bool:
+    """True if a phase-1 source raised or came back empty or as an error"""
+    if isinstance(result, Exception) or not result:
+        return True
+    return isinstance(result, dict) and (
+        "error" in result or result.get("status") == "error" or result.get("data_source") in ("error", "fallback")
+    )
+
+
+def _ok(result: Any, default: Any, name: str) -> Any:
+    """Return a gather() result, or the default (logging the failure) if the task raised"""
+    if isinstance(result, Exception):
+        logger.warning(f"Analytics task '{name}' failed: {result!r}")
+        return default
+    return result
+
+
+@lru_cache(maxsize=4096)
+def _default_visibility_platforms(domain: str) -> tuple:
+    """Deterministic default AI visibility platforms for a domain"""
+    domain_lower = domain.lower()
+    brand = next((b for b in BRAND_DEFAULT_PLATFORMS if b in domain_lower), None)
+    if brand:
+        return BRAND_DEFAULT_PLATFORMS[brand]
+    
+    # Generate hash-based values for other domains
+    domain_hash = zlib.crc32(domain.encode()) if domain else 12345
+    base = 500 + (domain_hash % 5000)
+    return tuple(
+        {"name": name, "mentions": int(base * mentions_k), "cited": int(base * cited_k), "color": color}
+        for name, mentions_k, cited_k, color in GENERIC_PLATFORM_TEMPLATE
+    )
+
+
+# Last computed wall time, YYYYMMDD and ISO timestamp; refreshed at most twice a second
+_DATE_CACHE: Dict[str, Any] = {"t": 0.0, "day": "", "iso": ""}
+
+
+def _now_strings() -> Tuple[str, str]:
+    """Return the current UTC date as (YYYYMMDD, ISO-8601), reusing the last value for up to 0.5s"""
+    t = time.time()
+    if t - _DATE_CACHE["t"] > 0.5:
+        dt = datetime.now(timezone.utc)
+        _DATE_CACHE.update(t=t, day=dt.strftime('%Y%m%d'), iso=dt.isoformat())
+    return _DATE_CACHE["day"], _DATE_CACHE["iso"]
+
+
+@lru_cache(maxsize=4096)
+def _domain_fingerprint(domain: str) -> Tuple[int, str, str]:
+    """Per-domain seed values for the estimate generators: (hash_int, domain_lower, brand)"""
+    # Non-cryptographic and stable across processes, which is all the seed needs
+    domain_hash = zlib.crc32(domain.encode())
+    domain_lower = domain.lower()
+    return domain_hash, domain_lower, domain_lower.split('.')[0]
+
+
+@lru_cache(maxsize=4096)
+def _traffic_kernel(base_organic: int, base_direct: int, base_referral: int, domain_hash: int) -> Tuple[Tuple[int, int, int], ...]:
+    """Numeric core of the mock traffic trend: one (organic, direct, referral) row per trend month"""
+    rows = []
+    for i, growth_factor in enumerate(MOCK_GROWTH_FACTORS):
+        variation = 0.95 + ((domain_hash + i) % 15) / 100  # 0.95 to 1.10
+        rows.append((
+            int(base_organic * variation * growth_factor),
+            int(base_direct * variation * growth_factor),
+            int(base_referral * variation * growth_factor)
+        ))
+    return tuple(rows)
+
+
+@lru_cache(maxsize=4096)
+def _backlink_growth_kernel(referring_domains: int) -> Tuple[int, ...]:
+    """Numeric core of the mock backlink trend: linear climb from 90% to 100% over the trend months"""
+    base_domains = int(referring_domains * 0.9)
+    steps = len(TREND_MONTHS) - 1
+    return tuple(base_domains + int((referring_domains - base_domains) * i / steps) for i in range(steps + 1))
+
+
+@lru_cache(maxsize=8192)
+def _humanize(n: int, k_digits: int = 0, empty: str = "–") -> str:
+    """Format a count for dashboard cards (e.g. 1.2M, 15K); empty is shown for zero"""
+    if n >= 1_000_000:
+        return f"{n / 1_000_000:.1f}M"
+    if n >= 1000:
+        return f"{n / 1000:.{k_digits}f}K"
+    return str(n) if n else empty
+
+
+# Chart series that can be served column-oriented (parallel arrays) instead of as row objects
+COLUMNAR_SERIES = ("ai_visibility", "keyword_positions", "traffic_trend")
+
+
+def _columns(rows: List[Dict[str, Any]]) -> Dict[str, list]:
+    """Turn a list of uniform row dicts into a dict of parallel arrays"""
+    if not rows:
+        return {}
+    return {key: [row.get(key) for row in rows] for key in rows[0]}
+
+
+def to_columnar(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Return a copy of an analytics payload with the chart series in columnar form,
+    e.g. ai_visibility -> {"name": [...], "mentions": [...], "cited": [...], "color": [...]}.
+    The cached payload itself is left untouched.
+    """
+    columnar = dict(payload)
+    for key in COLUMNAR_SERIES:
+        rows = payload.get(key)
+        if isinstance(rows, list):
+            columnar[key] = _columns(rows)
+    return columnar
+
+
+def _fmt_vol(val: int) -> str:
+    """Format a keyword volume/traffic estimate (1.2M, 15K, 950)"""
+    return _humanize(val, 0, "0")
+
 
 class AnalyticsService:
     """Unified analytics service that aggregates data from all SEO agents"""
     
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY) if settings.OPENAI_API_KEY else None
-        # Import services lazily to avoid circular imports
-        from app.services.seo_auditor import SEOAuditorService
-        from app.services.ai_visibility import AIVisibilityService
-        from app.services.competitive_intel import CompetitiveIntelService
-        from app.services.keyword_engine import KeywordEngineService
+        self.client = get_openai_client()
+        # Shared connection pool for outbound API calls made on behalf of this service
+        self.http = httpx.AsyncClient(
+            http2=find_spec("h2") is not None,
+            headers=DEFAULT_HEADERS,
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=50, max_connections=100, keepalive_expiry=30)
+        )
+        # Reuse the process-wide service singletons (imported lazily to avoid circular imports)
+        from app.services.seo_auditor import seo_auditor_service
+        from app.services.ai_visibility import ai_visibility_service
+        from app.services.competitive_intel import competitive_intel_service
+        from app.services.keyword_engine import keyword_engine_service
         from app.services.rag_engine import rag_engine
         
-        self.auditor = SEOAuditorService()
-        self.visibility_service = AIVisibilityService()
-        self.competitor_service = CompetitiveIntelService()
-        self.keyword_engine = KeywordEngineService()
+        self.auditor = seo_auditor_service
+        self.visibility_service = ai_visibility_service
+        self.competitor_service = competitive_intel_service
+        self.keyword_engine = keyword_engine_service
         self.rag_engine = rag_engine
 
-    
-    async def get_domain_analytics(self, domain: str) -> Dict[str, Any]:
+        # In-process result cache: clean_domain -> payload
+        self._cache = TTLCache(maxsize=1024, ttl=settings.ANALYTICS_CACHE_TTL_SECONDS)
+        # Strong references to fire-and-forget tasks so they aren't garbage collected
+        self._bg_tasks: set = set()
+        # LLM insights keyed by a digest of the data summary they were generated from
+        self._insights_cache = TTLCache(maxsize=512, ttl=24 * 3600)
+
+    async def aclose(self):
+        """Wait for pending background writes, then close the shared HTTP connection pool"""
+        if self._bg_tasks:
+            await asyncio.gather(*self._bg_tasks, return_exceptions=True)
+        await self.http.aclose()
+
+    def _spawn_background(self, coro) -> asyncio.Task:
+        """Schedule a coroutine without awaiting it, keeping a reference until it finishes"""
+        task = asyncio.create_task(coro)
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._bg_tasks.discard)
+        return task
+
+    async def _store_with_timeout(self, name: str, facts: Dict[str, Any], entity_type: str, timeout: float = 5.0):
+        """Store knowledge for RAG, giving up after the timeout"""
+        try:
+            async with asyncio.timeout(timeout):
+                await self.rag_engine.store_knowledge(name=name, facts=facts, entity_type=entity_type)
+        except TimeoutError:
+            logger.warning(f"RAG storage timed out ({timeout:g}s)")
+        except Exception as e:
+            logger.error(f"Failed to ingest knowledge for RAG: {e}")
+
+    @staticmethod
+    def _clean_domain(domain: str) -> str:
+        """Strip scheme, www. and path from a domain or URL and lowercase it"""
+        return _DOMAIN_RE.sub('', domain, count=1).split('/', 1)[0].lower()
+
+    def flush_domain(self, domain: str) -> bool:
+        """Drop cached analytics for a domain. Returns True if an entry was removed."""
+        return self._cache.pop(self._clean_domain(domain), None) is not None
+
+    def _cached_analytics(self, cache_key: str, force_refresh: bool = False) -> Optional[Dict[str, Any]]:
+        """Return the cached payload for a clean domain if it is still fresh"""
+        if not force_refresh and cache_key in self._cache:
+            logger.info(f"Analytics cache hit for: {cache_key}")
+            return self._cache[cache_key]
+        return None
+
+    def _store_analytics(self, cache_key: str, parts: Dict[str, Any], payload: Dict[str, Any]):
+        """Cache a payload unless it was built mostly from fallback defaults"""
+        fallback = parts["fallback_sources"]
+        if len(fallback) * 2 >= len(PHASE1_TASK_NAMES):
+            logger.warning(f"Not caching analytics for {cache_key}: fallback data for {', '.join(fallback)}")
+            return
+        self._cache[cache_key] = payload
+
+    async def get_domain_analytics(self, domain: str, force_refresh: bool = False) -> Dict[str, Any]:
         """
         Get comprehensive analytics for a domain by orchestrating all agents
-        Returns structured data optimized for chart rendering
+        Returns structured data optimized for chart rendering.
+        Results are cached in-process for ANALYTICS_CACHE_TTL_SECONDS;
+        force_refresh bypasses this and the authority/backlink caches.
+        """
+        cache_key = self._clean_domain(domain)
+        cached = self._cached_analytics(cache_key, force_refresh)
+        if cached is not None:
+            return cached
+
+        parts = await self._collect_domain_data(domain, force_refresh=force_refresh)
+        result = await self._build_domain_analytics(parts)
+        self._store_analytics(cache_key, parts, result)
+        return result
+
+    async def stream_domain_analytics(self, domain: str, force_refresh: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of get_domain_analytics.
+        Yields an "analytics" event with the chart data as soon as it is ready,
+        then one "insight" event per AI insight section as the LLM produces it,
+        then "done". The assembled payload is cached like the non-streaming path.
         """
+        cache_key = self._clean_domain(domain)
+        cached = self._cached_analytics(cache_key, force_refresh)
+        if cached is not None:
+            yield {"event": "analytics", "data": cached}
+            yield {"event": "done", "data": {"domain": cache_key, "cached": True}}
+            return
+
+        parts = await self._collect_domain_data(domain, force_refresh=force_refresh)
+        payload = self._assemble_analytics(parts, ai_insights=None)
+        yield {"event": "analytics", "data": payload}
+
+        ai_insights = {}
+        async for key, value in self._stream_ai_insights(
+            parts["seo_data"], parts["visibility_data"], parts["competitor_data"],
+            parts["keyword_data"], parts["context"]
+        ):
+            ai_insights[key] = value
+            yield {"event": "insight", "data": {key: value}}
+
+        payload["ai_insights"] = ai_insights
+        self._store_analytics(cache_key, parts, payload)
+        yield {"event": "done", "data": {"domain": cache_key, "cached": False}}
+
+    async def _build_domain_analytics(self, parts: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the full payload, AI insights included, from collected agent data (uncached)"""
+        # Generate AI insights (now RAG-augmented) as a task and build the chart data in a
+        # worker thread, so the event loop is free to send the request while it runs
+        insights_task = asyncio.create_task(self._generate_ai_insights(
+            parts["seo_data"], parts["visibility_data"], parts["competitor_data"],
+            parts["keyword_data"], parts["context"]
+        ))
+        payload = await asyncio.to_thread(self._assemble_analytics, parts, None)
+        payload["ai_insights"] = await insights_task
+        return payload
+
+    async def _collect_domain_data(self, domain: str, force_refresh: bool = False) -> Dict[str, Any]:
+        """Run the agent fan-out for a domain and return the raw results needed to build the payload"""
         logger.info(f"Starting comprehensive analytics for: {domain}")
         
         # Normalize domain
         if not domain.startswith('http'):
             domain = f"https://{domain}"
         
-        clean_domain = domain.replace('https://', '').replace('http://', '').replace('www.', '').split('/')[0]
+        clean_domain = self._clean_domain(domain)
         brand_name = clean_domain.split('.')[0]
         
+        # Start the RAG context lookup first so it overlaps with all other I/O
+        context_task = asyncio.create_task(self._safe_rag_query(clean_domain))
+        
         # GLOBAL PARALLELIZATION: Run ALL independent tasks concurrently for maximum speed
         tasks = [
             external_apis.get_ddg_research(f"{clean_domain} rankings"), # SERP
@@ -64,85 +411,95 @@ class AnalyticsService:
             self._get_keyword_metrics(brand_name),                      # Keywords
             google_metrics.get_gsc_data(clean_domain),                 # GSC
             google_metrics.get_analytics_data("default"),               # GA
+            external_apis.get_domain_authority(clean_domain, client=self.http, force_refresh=force_refresh),  # Authority
+            external_apis.get_ddg_research(brand_name),                 # Brand SERP presence
         ]
         
         results = await asyncio.gather(*tasks, return_exceptions=True)
+        fallback_sources = [name for result, name in zip(results, PHASE1_TASK_NAMES) if _is_fallback(result)]
         
-        # Unpack results
-        serp_data, seo_data, visibility_data, competitor_data, keyword_data, gsc_data, ga_data = results
-        
-        # Guard against exceptions in parallel tasks
-        serp_data = serp_data if not isinstance(serp_data, Exception) else {"results": []}
-        seo_data = seo_data if not isinstance(seo_data, Exception) else {}
-        visibility_data = visibility_data if not isinstance(visibility_data, Exception) else {}
-        competitor_data = competitor_data if not isinstance(competitor_data, Exception) else {}
-        keyword_data = keyword_data if not isinstance(keyword_data, Exception) else {}
-        gsc_data = gsc_data if not isinstance(gsc_data, Exception) else {}
-        ga_data = ga_data if not isinstance(ga_data, Exception) else {}
+        # Unpack results, substituting (fresh) defaults for failed tasks
+        defaults = ({"results": []}, {}, {}, {}, {}, {}, {}, {}, {"results": []})
+        (serp_data, seo_data, visibility_data, competitor_data, keyword_data,
+         gsc_data, ga_data, authority_data, brand_search) = (
+            _ok(result, default, name) for result, default, name in zip(results, defaults, PHASE1_TASK_NAMES)
+        )
 
         # Attach SERP data to seo_data for downstream logic
         if isinstance(seo_data, dict):
             seo_data["serp_rankings"] = serp_data.get("results", [])
 
-        # PHASE 2: Lightweight calculations that rely on above data
-        # These are mostly mathematical or fast API calls, still run in parallel
+        # PHASE 2: Calculations on top of the prefetched authority data.
+        # Only the CommonCrawl sample still hits the network (it scales by authority).
         secondary_tasks = [
-            self._estimate_traffic_data(clean_domain, seo_data=seo_data, serp_data=serp_data),
-            self._get_backlink_estimates(clean_domain, seo_data=seo_data, authority_score=seo_data.get("overall_score", 0)),
+            self._estimate_traffic_data(
+                clean_domain, seo_data=seo_data, serp_data=serp_data,
+                authority_data=authority_data, brand_search=brand_search
+            ),
+            self._get_backlink_estimates(
+                clean_domain, seo_data=seo_data, authority_score=seo_data.get("overall_score", 0),
+                authority_data=authority_data, force_refresh=force_refresh
+            ),
         ]
         
-        secondary_results = await asyncio.gather(*secondary_tasks, return_exceptions=True)
-        traffic_data, backlink_data = secondary_results
-        
-        traffic_data = traffic_data if not isinstance(traffic_data, Exception) else {"trend": [], "data_source": "error"}
-        backlink_data = backlink_data if not isinstance(backlink_data, Exception) else {}
-        
-        # Determine GSC connection status
-        gsc_connected = gsc_data.get("status") == "success"
+        traffic_result, backlink_result = await asyncio.gather(*secondary_tasks, return_exceptions=True)
+        traffic_data = _ok(traffic_result, {"trend": [], "data_source": "error"}, "traffic")
+        backlink_data = _ok(backlink_result, {}, "backlinks")
         
         # NOTE: SERP data already attached in PHASE 1
         
-        # Store findings in Knowledge Graph for future RAG (Non-blocking with timeout)
-        try:
-            # We use wait_for to ensure RAG doesn't hang the entire thread
-            await asyncio.wait_for(
-                self.rag_engine.store_knowledge(
-                    name=f"{clean_domain}_audit_{datetime.utcnow().strftime('%Y%m%d')}",
-                    facts={
-                        "seo_score": seo_data.get("overall_score", 0),
-                        "ai_visibility": visibility_data.get("visibility_score", 0),
-                        "tech_stack": seo_data.get("business_intelligence", {}).get("tech_stack", {}),
-                        "performance": seo_data.get("performance", {}).get("score", 0),
-                        "top_issues": [i["title"] for i in seo_data.get("issues", [])][:3],
-                        "serp_rankings": serp_data.get("results", [])[:3]
-                    },
-                    entity_type="AuditSummary"
-                ),
-                timeout=5.0
-            )
-        except asyncio.TimeoutError:
-            logger.warning("RAG storage timed out (5s)")
-        except Exception as e:
-            logger.error(f"Failed to ingest knowledge for RAG: {e}")
+        # Store findings in Knowledge Graph for future RAG.
+        # The response doesn't depend on the write, so run it in the background.
+        self._spawn_background(self._store_with_timeout(
+            name=f"{clean_domain}_audit_{_now_strings()[0]}",
+            facts={
+                "seo_score": seo_data.get("overall_score", 0),
+                "ai_visibility": visibility_data.get("visibility_score", 0),
+                "tech_stack": seo_data.get("business_intelligence", {}).get("tech_stack", {}),
+                "performance": seo_data.get("performance", {}).get("score", 0),
+                "top_issues": [i["title"] for i in seo_data.get("issues", [])][:3],
+                "serp_rankings": serp_data.get("results", [])[:3]
+            },
+            entity_type="AuditSummary"
+        ))
 
-        # Retrieve relevant context from Knowledge Graph (with timeout)
-        context = []
-        try:
-            related_knowledge = await asyncio.wait_for(
-                self.rag_engine.query_knowledge(f"SEO and AI visibility for {clean_domain}"),
-                timeout=5.0
-            )
-            context = [k["facts"] for k in related_knowledge]
-        except asyncio.TimeoutError:
-            logger.warning("RAG retrieval timed out (5s)")
-        except Exception as e:
-            logger.warn(f"RAG retrieval failed: {e}")
+        # Use RAG context only if it arrived while phase 1/2 ran; never wait on it
+        if context_task.done():
+            context = context_task.result()
+        else:
+            context_task.cancel()
+            context = []
+            logger.info("RAG context not ready, generating insights without it")
+
+        return {
+            "clean_domain": clean_domain,
+            "serp_data": serp_data,
+            "seo_data": seo_data,
+            "visibility_data": visibility_data,
+            "competitor_data": competitor_data,
+            "keyword_data": keyword_data,
+            "gsc_data": gsc_data,
+            "traffic_data": traffic_data,
+            "backlink_data": backlink_data,
+            "context": context,
+            "fallback_sources": fallback_sources,
+        }
+
+    def _assemble_analytics(self, parts: Dict[str, Any], ai_insights: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the chart-ready response payload from collected agent data"""
+        clean_domain = parts["clean_domain"]
+        serp_data = parts["serp_data"]
+        seo_data = parts["seo_data"]
+        visibility_data = parts["visibility_data"]
+        competitor_data = parts["competitor_data"]
+        keyword_data = parts["keyword_data"]
+        gsc_data = parts["gsc_data"]
+        traffic_data = parts["traffic_data"]
+        backlink_data = parts["backlink_data"]
+
+        # Determine GSC connection status
+        gsc_connected = gsc_data.get("status") == "success"
 
-        # Generate AI insights (now RAG-augmented)
-        ai_insights = await self._generate_ai_insights(
-            seo_data, visibility_data, competitor_data, keyword_data, context
-        )
-        
         # Use real GSC data for top_keywords if connected, otherwise generate estimates
         if gsc_connected and gsc_data.get("top_queries"):
             top_keywords = self._format_gsc_keywords(gsc_data.get("top_queries", []))
@@ -157,9 +514,15 @@ class AnalyticsService:
         traffic_source = traffic_data.get("data_source", "calculated") if isinstance(traffic_data, dict) else "unknown"
         backlink_source = backlink_data.get("data_source", "calculated") if isinstance(backlink_data, dict) else "unknown"
         
+        summary_metrics = self._build_summary_metrics(seo_data, visibility_data, competitor_data, backlink_data, traffic_data, keyword_data)
+        ai_visibility = self._format_ai_visibility(visibility_data, clean_domain)
+        keyword_positions = self._generate_keyword_position_data(keyword_data)
+        backlink_trend = self._format_backlink_trend(backlink_data)
+        authority_distribution = self._generate_authority_distribution(backlink_data)
+        
         return {
             "domain": clean_domain,
-            "analyzed_at": datetime.utcnow().isoformat(),
+            "analyzed_at": _now_strings()[1],
             "gsc_status": "connected" if gsc_connected else "not_connected",
             "data_sources": {
                 "keywords": keywords_source,
@@ -167,12 +530,12 @@ class AnalyticsService:
                 "authority": backlink_source,
                 "serp": "duckduckgo"
             },
-            "summary_metrics": self._build_summary_metrics(seo_data, visibility_data, competitor_data, backlink_data, traffic_data, keyword_data),
-            "ai_visibility": self._format_ai_visibility(visibility_data, clean_domain),
+            "summary_metrics": summary_metrics,
+            "ai_visibility": ai_visibility,
             "traffic_trend": traffic_trend_data,
-            "keyword_positions": self._generate_keyword_position_data(keyword_data),
-            "backlink_trend": self._format_backlink_trend(backlink_data),
-            "authority_distribution": self._generate_authority_distribution(backlink_data),
+            "keyword_positions": keyword_positions,
+            "backlink_trend": backlink_trend,
+            "authority_distribution": authority_distribution,
             "top_keywords": top_keywords,
             "serp_rankings": serp_data.get("results", []),
             "seo_issues": seo_data.get('issues', []),
@@ -190,6 +553,18 @@ class AnalyticsService:
             }
         }
     
+    async def _safe_rag_query(self, domain: str, timeout: float = 3.0) -> List[Dict[str, Any]]:
+        """Fetch related knowledge-graph facts for a domain; returns [] on timeout or error"""
+        try:
+            async with asyncio.timeout(timeout):
+                related_knowledge = await self.rag_engine.query_knowledge(f"SEO and AI visibility for {domain}")
+            return [k["facts"] for k in related_knowledge]
+        except TimeoutError:
+            logger.warning(f"RAG retrieval timed out ({timeout:g}s)")
+        except Exception as e:
+            logger.warning(f"RAG retrieval failed: {e}")
+        return []
+
     async def _get_seo_metrics(self, url: str) -> Dict[str, Any]:
         """Get SEO audit metrics"""
         try:
@@ -231,14 +606,24 @@ class AnalyticsService:
             logger.error(f"Keyword research failed: {e}")
             return {"keywords": []}
     
-    async def _estimate_traffic_data(self, domain: str, seo_data: Dict = None, serp_data: Dict = None) -> Dict[str, Any]:
+    async def _estimate_traffic_data(
+        self,
+        domain: str,
+        seo_data: Dict = None,
+        serp_data: Dict = None,
+        authority_data: Dict = None,
+        brand_search: Dict = None,
+        force_refresh: bool = False
+    ) -> Dict[str, Any]:
         """
         Calculate traffic estimates using REAL data signals.
         Uses authority score + performance as proxy for traffic level.
+        Pass prefetched authority_data / brand_search to skip the network calls.
         """
         try:
-            # 1. Get domain authority (already fetched, but get fresh if needed)
-            authority_data = await external_apis.get_domain_authority(domain)
+            # 1. Get domain authority (fetch only if the caller didn't prefetch it)
+            if authority_data is None:
+                authority_data = await external_apis.get_domain_authority(domain, client=self.http, force_refresh=force_refresh)
             authority = authority_data.get("domain_authority", 0)
             global_rank = authority_data.get("global_rank", 0)
             
@@ -248,7 +633,8 @@ class AnalyticsService:
                 performance_score = seo_data.get("performance", {}).get("score", 50)
             
             # 3. Get SERP presence for brand
-            brand_search = await external_apis.get_ddg_research(domain.split('.')[0])
+            if brand_search is None:
+                brand_search = await external_apis.get_ddg_research(domain.split('.')[0])
             serp_presence = len(brand_search.get("results", []))
             
             # 4. CALCULATE traffic using Authority-based formula
@@ -298,19 +684,15 @@ class AnalyticsService:
             base_referral = int(base_monthly_organic * 0.15)
             
             # 5. Generate 6-month trend with slight variations
-            months = ["Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
-            traffic_trend = []
-            
-            for i, month in enumerate(months):
-                growth_factor = 1 + (i * 0.02)
-                seasonal = 1.1 if month in ["Nov", "Dec"] else 1.0
-                
-                traffic_trend.append({
+            traffic_trend = [
+                {
                     "month": month,
                     "organic": int(base_monthly_organic * growth_factor * seasonal),
                     "direct": int(base_direct * growth_factor * seasonal),
                     "referral": int(base_referral * growth_factor * seasonal)
-                })
+                }
+                for month, growth_factor, seasonal in TRAFFIC_TREND_FACTORS
+            ]
             
             total_monthly = base_monthly_organic + base_direct + base_referral
             logger.info(f"Calculated traffic for {domain}: {total_monthly}/month (auth: {authority}, rank: {global_rank})")
@@ -342,14 +724,23 @@ class AnalyticsService:
             }
 
     
-    async def _get_backlink_estimates(self, domain: str, seo_data: Dict = None, authority_score: int = 0) -> Dict[str, Any]:
+    async def _get_backlink_estimates(
+        self,
+        domain: str,
+        seo_data: Dict = None,
+        authority_score: int = 0,
+        authority_data: Dict = None,
+        force_refresh: bool = False
+    ) -> Dict[str, Any]:
         """
         Get backlink and authority data from REAL APIs.
         Uses: OpenPageRank (authority), CommonCrawl (backlinks)
+        Pass prefetched authority_data to skip the OpenPageRank call.
         """
         try:
-            # 1. Get REAL Domain Authority from OpenPageRank API
-            authority_data = await external_apis.get_domain_authority(domain)
+            # 1. Get REAL Domain Authority from OpenPageRank API (unless prefetched)
+            if authority_data is None:
+                authority_data = await external_apis.get_domain_authority(domain, client=self.http, force_refresh=force_refresh)
             computed_authority = authority_data.get("domain_authority", 0)
             page_rank = authority_data.get("page_rank", 0)
             global_rank = authority_data.get("global_rank", 0)
@@ -358,7 +749,7 @@ class AnalyticsService:
             scaling_authority = max(computed_authority, authority_score)
             
             # 2. Get REAL Backlink Count from CommonCrawl
-            backlink_data = await external_apis.get_backlink_count(domain, authority_score=scaling_authority)
+            backlink_data = await external_apis.get_backlink_count(domain, authority_score=scaling_authority, client=self.http, force_refresh=force_refresh)
             total_backlinks = backlink_data.get("total_backlinks", 0)
             referring_domains = backlink_data.get("referring_domains", 0)
             
@@ -382,16 +773,14 @@ class AnalyticsService:
                 authority_score = int(age_score + performance_score + backlink_score)
                 authority_score = max(0, min(100, authority_score))
             
-            # 4. Generate trend (deterministic based on domain hash)
-            import hashlib
-            domain_hash = int(hashlib.md5(domain.encode()).hexdigest()[:8], 16)
-            months = ["Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+            # 4. Generate trend
             base_domains = max(1, int(referring_domains * 0.85))
+            growth_span = referring_domains - base_domains
             
-            monthly_growth = []
-            for i, month in enumerate(months):
-                growth = base_domains + int((referring_domains - base_domains) * (i / 5))
-                monthly_growth.append({"month": month, "domains": max(1, growth)})
+            monthly_growth = [
+                {"month": month, "domains": max(1, base_domains + int(growth_span * step))}
+                for month, step in BACKLINK_TREND_STEPS
+            ]
             
             # Determine data source
             data_source = "openpagerank" if authority_data.get("data_source") == "openpagerank" else "calculated"
@@ -429,37 +818,40 @@ class AnalyticsService:
             }
 
     
-    async def _generate_ai_insights(
-        self, 
-        seo_data: Dict, 
-        visibility_data: Dict, 
-        competitor_data: Dict, 
+    def _insights_request(
+        self,
+        seo_data: Dict,
+        visibility_data: Dict,
+        competitor_data: Dict,
         keyword_data: Dict,
         context: List[Dict] = None
-    ) -> Dict[str, Any]:
-        """Generate AI-powered insights from all collected data and RAG context"""
-        if not self.client:
-            return {"summary": "AI insights unavailable", "recommendations": []}
+    ) -> Tuple[str, List[Dict[str, str]]]:
+        """Build the insights cache key and chat messages from the collected data"""
+        data_summary = {
+            "seo_score": seo_data.get("overall_score", seo_data.get("score", 0)),
+            "issues_count": len(seo_data.get("issues", [])),
+            "critical_issues": [i["title"] for i in seo_data.get("issues", []) if i.get("severity") in ["critical", "high"]][:5],
+            "performance": seo_data.get("performance", {}),
+            "tech_stack": seo_data.get("business_intelligence", {}).get("tech_stack", {}),
+            "domain_history": seo_data.get("business_intelligence", {}).get("domain_history", {}),
+            "ai_visibility_score": visibility_data.get("visibility_score", 0),
+            "platforms": list(visibility_data.get("platforms", {}).keys()),
+            "estimated_authority": competitor_data.get("estimated_authority", 50),
+            "keyword_data": keyword_data.get("related_keywords", [])[:5] if keyword_data else [],
+            "serp_rankings": seo_data.get("serp_rankings", [])[:3],
+            "historical_context": context or []
+        }
+        # Empty values carry no signal for the model; leave them out of the prompt
+        data_summary = {k: v for k, v in data_summary.items() if v not in (None, "", [], {})}
+        data_json = orjson.dumps(data_summary, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
         
-        try:
-            data_summary = {
-                "seo_score": seo_data.get("overall_score", seo_data.get("score", 0)),
-                "issues_count": len(seo_data.get("issues", [])),
-                "critical_issues": [i["title"] for i in seo_data.get("issues", []) if i.get("severity") in ["critical", "high"]][:5],
-                "performance": seo_data.get("performance", {}),
-                "tech_stack": seo_data.get("business_intelligence", {}).get("tech_stack", {}),
-                "domain_history": seo_data.get("business_intelligence", {}).get("domain_history", {}),
-                "ai_visibility_score": visibility_data.get("visibility_score", 0),
-                "platforms": list(visibility_data.get("platforms", {}).keys()),
-                "estimated_authority": competitor_data.get("estimated_authority", 50),
-                "keyword_data": keyword_data.get("related_keywords", [])[:5] if keyword_data else [],
-                "serp_rankings": seo_data.get("serp_rankings", []),
-                "historical_context": context or []
-            }
-            
-            prompt = f"""Analyze this SEO data and provide strategic insights:
+        cache_key = hashlib.blake2b(
+            orjson.dumps(data_summary, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str), digest_size=16
+        ).hexdigest()
+        
+        prompt = f"""Analyze this SEO data and provide strategic insights:
 
-Data: {json.dumps(data_summary, indent=2)}
+Data: {data_json}
 
 Provide:
 1. Executive summary (2-3 sentences)
@@ -477,19 +869,99 @@ Return JSON format:
     "action_plan": ["Week 1: ...", "Week 2: ...", "Week 3: ...", "Week 4: ..."]
 }}"""
 
+        messages = [
+            {"role": "system", "content": "You are a senior SEO strategist providing actionable insights."},
+            {"role": "user", "content": prompt}
+        ]
+        return cache_key, messages
+
+    async def _generate_ai_insights(
+        self, 
+        seo_data: Dict, 
+        visibility_data: Dict, 
+        competitor_data: Dict, 
+        keyword_data: Dict,
+        context: List[Dict] = None
+    ) -> Dict[str, Any]:
+        """Generate AI-powered insights from all collected data and RAG context"""
+        if not self.client:
+            return {"summary": "AI insights unavailable", "recommendations": []}
+        
+        try:
+            cache_key, messages = self._insights_request(seo_data, visibility_data, competitor_data, keyword_data, context)
+            if cache_key in self._insights_cache:
+                return self._insights_cache[cache_key]
+
             response = await self.client.chat.completions.create(
                 model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are a senior SEO strategist providing actionable insights."},
-                    {"role": "user", "content": prompt}
-                ],
-                response_format={"type": "json_object"}
+                messages=messages,
+                response_format={"type": "json_object"},
+                temperature=0,
+                max_tokens=800
             )
             
-            return json.loads(response.choices[0].message.content)
+            insights = orjson.loads(response.choices[0].message.content)
+            self._insights_cache[cache_key] = insights
+            return insights
         except Exception as e:
             logger.error(f"AI insights generation failed: {e}")
             return {"executive_summary": "Analysis complete. Review metrics above.", "priority_actions": []}
+
+    async def _stream_ai_insights(
+        self,
+        seo_data: Dict,
+        visibility_data: Dict,
+        competitor_data: Dict,
+        keyword_data: Dict,
+        context: List[Dict] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Streaming variant of _generate_ai_insights.
+        Yields (section, value) pairs as soon as each top-level JSON member is complete.
+        """
+        if not self.client:
+            for item in {"summary": "AI insights unavailable", "recommendations": []}.items():
+                yield item
+            return
+
+        emitted = set()
+        try:
+            cache_key, messages = self._insights_request(seo_data, visibility_data, competitor_data, keyword_data, context)
+            if cache_key in self._insights_cache:
+                for item in self._insights_cache[cache_key].items():
+                    yield item
+                return
+
+            stream = await self.client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=messages,
+                response_format={"type": "json_object"},
+                temperature=0,
+                max_tokens=800,
+                stream=True
+            )
+            parser = JSONObjectStream()
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                for key, value in parser.feed(chunk.choices[0].delta.content or ""):
+                    emitted.add(key)
+                    yield key, value
+
+            # The member parser and a full parse agree on well-formed output; the full
+            # parse also catches anything the incremental pass could not split out
+            insights = orjson.loads(parser.text)
+            for key, value in insights.items():
+                if key not in emitted:
+                    emitted.add(key)
+                    yield key, value
+            self._insights_cache[cache_key] = insights
+        except Exception as e:
+            logger.error(f"AI insights streaming failed: {e}")
+            fallback = {"executive_summary": "Analysis complete. Review metrics above.", "priority_actions": []}
+            for key, value in fallback.items():
+                if key not in emitted:
+                    yield key, value
     
     def _build_summary_metrics(
         self, 
@@ -507,12 +979,7 @@ Return JSON format:
             monthly_traffic = traffic_data.get("monthly_estimate", 0)
         
         # Format traffic for display
-        if monthly_traffic >= 1000000:
-            traffic_display = f"{monthly_traffic / 1000000:.1f}M"
-        elif monthly_traffic >= 1000:
-            traffic_display = f"{monthly_traffic / 1000:.1f}K"
-        else:
-            traffic_display = str(monthly_traffic)
+        traffic_display = _humanize(monthly_traffic, k_digits=1, empty="0")
         
         # Get authority from calculated backlink data
         authority = backlink_data.get("authority_score", 0) if isinstance(backlink_data, dict) else 0
@@ -530,7 +997,8 @@ Return JSON format:
         # Enterprise Fallback based on Domain Authority and Brand
         # This ensures high-DA sites never show "-" even if live research fails
         if keyword_count == 0:
-            if "amazon" in seo_data.get("url", "").lower() or "amazon" in seo_data.get("domain", "").lower():
+            brand = f"{seo_data.get('url', '')} {seo_data.get('domain', '')}".lower()
+            if "amazon" in brand:
                 keyword_count = 1250000
             elif seo_data.get("overall_score", 0) > 75:
                 keyword_count = 15000
@@ -538,14 +1006,7 @@ Return JSON format:
                 keyword_count = 500
         
         # Format for UI display (e.g., 1.2M, 15K)
-        if keyword_count >= 1000000:
-            keyword_display = f"{keyword_count / 1000000:.1f}M"
-        elif keyword_count >= 1000:
-            keyword_display = f"{keyword_count / 1000:.0f}K"
-        elif keyword_count > 0:
-            keyword_display = str(keyword_count)
-        else:
-            keyword_display = "–"
+        keyword_display = _humanize(keyword_count)
         
         return {
             "authority_score": authority,
@@ -560,58 +1021,28 @@ Return JSON format:
         }
     
     def _format_ai_visibility(self, visibility_data: Dict, domain: str = "") -> List[Dict[str, Any]]:
-        """Format AI visibility data for charts"""
+        """Format AI visibility data for charts; falls back to domain defaults only when no platform data exists"""
         platforms = visibility_data.get("platforms", {})
         
-        # Generate domain-specific defaults
-        import hashlib
-        domain_lower = domain.lower()
-        
-        if 'amazon' in domain_lower:
-            default_platforms = [
-                {"name": "ChatGPT", "mentions": 8500, "cited": 12000, "color": "#10B981"},
-                {"name": "AI Overview", "mentions": 15200, "cited": 28000, "color": "#3B82F6"},
-                {"name": "AI Mode", "mentions": 22000, "cited": 35000, "color": "#8B5CF6"},
-                {"name": "Gemini", "mentions": 9800, "cited": 18500, "color": "#F59E0B"},
-            ]
-        elif 'flipkart' in domain_lower:
-            default_platforms = [
-                {"name": "ChatGPT", "mentions": 3200, "cited": 4500, "color": "#10B981"},
-                {"name": "AI Overview", "mentions": 5800, "cited": 12000, "color": "#3B82F6"},
-                {"name": "AI Mode", "mentions": 8500, "cited": 15000, "color": "#8B5CF6"},
-                {"name": "Gemini", "mentions": 2800, "cited": 5200, "color": "#F59E0B"},
-            ]
-        else:
-            # Generate hash-based values for other domains
-            domain_hash = int(hashlib.md5(domain.encode()).hexdigest()[:8], 16) if domain else 12345
-            base = 500 + (domain_hash % 5000)
-            default_platforms = [
-                {"name": "ChatGPT", "mentions": base, "cited": int(base * 1.2), "color": "#10B981"},
-                {"name": "AI Overview", "mentions": int(base * 0.8), "cited": int(base * 2.5), "color": "#3B82F6"},
-                {"name": "AI Mode", "mentions": int(base * 1.5), "cited": int(base * 3), "color": "#8B5CF6"},
-                {"name": "Gemini", "mentions": int(base * 0.6), "cited": int(base * 0.4), "color": "#F59E0B"},
-            ]
-        
         if not platforms:
-            return default_platforms
+            # Domain-specific defaults (memoized per domain)
+            return list(_default_visibility_platforms(domain))
         
-        colors = {"chatgpt": "#10B981", "claude": "#8B5CF6", "perplexity": "#3B82F6", "gemini": "#F59E0B"}
-        result = []
-        for name, data in platforms.items():
-            result.append({
+        return [
+            {
                 "name": name.title(),
                 "mentions": data.get("mentions", 0) if isinstance(data, dict) else 0,
                 "cited": data.get("citations", 0) if isinstance(data, dict) else 0,
-                "color": colors.get(name.lower(), "#6B7280")
-            })
-        
-        return result if result else default_platforms
+                "color": AI_PLATFORM_COLORS.get(name.lower(), "#6B7280")
+            }
+            for name, data in platforms.items()
+        ]
     
     def _generate_keyword_position_data(self, keyword_data: Dict) -> List[Dict[str, Any]]:
         """Generate keyword position change data for charts"""
         # Generate realistic looking data based on keyword metrics
-        import random
-        random.seed(hash(str(keyword_data)))
+        # crc32 is stable across processes, unlike the builtin (salted) str hash
+        rng = random.Random(zlib.crc32(str(keyword_data).encode()))
         
         dates = ["Dec 3", "Dec 8", "Dec 13", "Dec 18", "Dec 23", "Dec 28", "Jan 2"]
         base_improved = keyword_data.get("search_volume", 300) // 10 if keyword_data else 280
@@ -619,8 +1050,8 @@ Return JSON format:
         return [
             {
                 "date": date,
-                "improved": max(50, base_improved + random.randint(-50, 100)),
-                "declined": max(20, random.randint(40, 120))
+                "improved": max(50, base_improved + rng.randint(-50, 100)),
+                "declined": max(20, rng.randint(40, 120))
             }
             for date in dates
         ]
@@ -633,24 +1064,18 @@ Return JSON format:
         
         # Generate trend from total
         total = backlink_data.get("referring_domains", 75000)
-        months = ["Feb", "Apr", "Jun", "Aug", "Oct", "Dec"]
-        
         return [
             {"month": month, "domains": int(total * (0.92 + i * 0.016))}
-            for i, month in enumerate(months)
+            for i, month in enumerate(BIMONTHLY_TREND_MONTHS)
         ]
     
     def _generate_authority_distribution(self, backlink_data: Dict) -> List[Dict[str, Any]]:
         """Generate authority distribution data"""
         total_domains = backlink_data.get("referring_domains", 75000)
         
-        # Typical distribution: most links come from low authority domains
         return [
-            {"range": "81-100", "count": int(total_domains * 0.002), "percent": 0.21},
-            {"range": "61-80", "count": int(total_domains * 0.006), "percent": 0.61},
-            {"range": "41-60", "count": int(total_domains * 0.023), "percent": 2.27},
-            {"range": "21-40", "count": int(total_domains * 0.087), "percent": 8.68},
-            {"range": "0-20", "count": int(total_domains * 0.882), "percent": 88.24},
+            {"range": r, "count": int(total_domains * ratio), "percent": percent}
+            for r, ratio, percent in AUTHORITY_DISTRIBUTION
         ]
     
     def _format_gsc_keywords(self, gsc_queries: List[Dict]) -> List[Dict[str, Any]]:
@@ -692,11 +1117,7 @@ Return JSON format:
 
     def _generate_top_keywords(self, domain: str, keyword_data: Dict, backlink_data: Dict) -> List[Dict[str, Any]]:
         """Generate top keywords data based on domain analysis (Universal)"""
-        import hashlib
-        
-        domain_lower = domain.lower()
-        domain_hash = int(hashlib.md5(domain.encode()).hexdigest()[:8], 16)
-        brand = domain.split('.')[0]
+        domain_hash, domain_lower, brand = _domain_fingerprint(domain)
         authority = backlink_data.get("authority_score", 0)
         
         # Universal Scaling for Volumes
@@ -704,24 +1125,28 @@ Return JSON format:
         vol_base = 1000000 if authority > 90 else (100000 if authority > 70 else (10000 if authority > 40 else 1000))
         vol_base += (domain_hash % (vol_base // 2))
         
-        def fmt_vol(val):
-            if val >= 1000000: return f"{val/1000000:.1f}M"
-            if val >= 1000: return f"{val/1000:.0f}K"
-            return str(val)
-
         # Generate universal keyword set based on brand and authority power
         keywords = [
-            {"keyword": brand, "position": 1, "volume": fmt_vol(vol_base), "traffic": fmt_vol(int(vol_base * 0.6)), "trend": "up"},
-            {"keyword": f"{brand} online", "position": 1 + (domain_hash % 2), "volume": fmt_vol(int(vol_base * 0.4)), "traffic": fmt_vol(int(vol_base * 0.2)), "trend": "up"},
-            {"keyword": f"buy {brand}", "position": 2 + (domain_hash % 3), "volume": fmt_vol(int(vol_base * 0.15)), "traffic": fmt_vol(int(vol_base * 0.05)), "trend": "stable"},
-            {"keyword": f"{brand} reviews", "position": 3 + (domain_hash % 5), "volume": fmt_vol(int(vol_base * 0.1)), "traffic": fmt_vol(int(vol_base * 0.02)), "trend": "up"},
-            {"keyword": "best deals online", "position": 10 + (domain_hash % 15), "volume": fmt_vol(int(vol_base * 0.8)), "traffic": fmt_vol(int(vol_base * 0.01)), "trend": "stable"},
+            {
+                "keyword": template.format(brand=brand),
+                "position": position + (domain_hash % spread),
+                "volume": _fmt_vol(int(vol_base * volume_k)),
+                "traffic": _fmt_vol(int(vol_base * traffic_k)),
+                "trend": trend
+            }
+            for template, position, spread, volume_k, traffic_k, trend in BRAND_KEYWORD_TEMPLATES
         ]
         
         # Add high-intent industry keywords if it's a "Powerful" site
         if authority > 75:
-            keywords.insert(2, {"keyword": "online shopping", "position": 2 + (domain_hash % 4), "volume": "2.8M", "traffic": fmt_vol(int(2800000 * 0.1)), "trend": "stable"})
-            keywords.insert(4, {"keyword": "free shipping", "position": 5 + (domain_hash % 8), "volume": "1.2M", "traffic": fmt_vol(int(1200000 * 0.05)), "trend": "up"})
+            for index, keyword, position, spread, volume, traffic_k, trend in POWER_KEYWORD_TEMPLATES:
+                keywords.insert(index, {
+                    "keyword": keyword,
+                    "position": position + (domain_hash % spread),
+                    "volume": _fmt_vol(volume),
+                    "traffic": _fmt_vol(int(volume * traffic_k)),
+                    "trend": trend
+                })
 
         return keywords[:7]
 
@@ -730,8 +1155,7 @@ Return JSON format:
         FALLBACK ONLY - used in except blocks when calculation fails.
         Returns minimal placeholder data with zeros.
         """
-        months = ["Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
-        return [{"month": m, "organic": 0, "direct": 0, "referral": 0} for m in months]
+        return [{"month": m, "organic": 0, "direct": 0, "referral": 0} for m in TREND_MONTHS]
     
     # ============= DEPRECATED MOCK FUNCTIONS =============
     # These should NOT be called from main code paths anymore.
@@ -745,27 +1169,18 @@ Return JSON format:
         """Generate mock backlink data"""
         return self._generate_mock_backlink_data_for_domain("example.com")
     
-    def _generate_mock_traffic_trend_for_domain(self, domain: str) -> List[Dict[str, Any]]:
-        """Generate domain-specific mock traffic data based on domain characteristics"""
-        import hashlib
-        
+    def _generate_mock_traffic_trend_columnar(self, domain: str) -> Dict[str, list]:
+        """
+        Domain-specific mock traffic trend as parallel arrays:
+        {"month": [...], "organic": [...], "direct": [...], "referral": [...]}
+        """
         # Use domain hash to generate consistent but different data per domain
-        domain_hash = int(hashlib.md5(domain.encode()).hexdigest()[:8], 16)
+        domain_hash, _, brand = _domain_fingerprint(domain)
         
         # Determine base traffic based on known domains
-        domain_lower = domain.lower()
-        if 'amazon' in domain_lower:
-            base_organic = 45000000  # 45M
-            base_direct = 25000000
-            base_referral = 8000000
-        elif 'flipkart' in domain_lower:
-            base_organic = 28000000  # 28M
-            base_direct = 15000000
-            base_referral = 5000000
-        elif 'google' in domain_lower:
-            base_organic = 100000000
-            base_direct = 80000000
-            base_referral = 20000000
+        known = KNOWN_DOMAIN_TRAFFIC.get(brand)
+        if known:
+            base_organic, base_direct, base_referral = known
         else:
             # Use hash to generate varied but reasonable numbers
             base_organic = 200000 + (domain_hash % 5000000)
@@ -773,48 +1188,29 @@ Return JSON format:
             base_referral = 30000 + (domain_hash % 500000)
         
         # Generate 6 months of data with some variation
-        months = ["Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
-        growth_factor = 1.0
-        result = []
-        
-        for i, month in enumerate(months):
-            variation = 0.95 + ((domain_hash + i) % 15) / 100  # 0.95 to 1.10
-            result.append({
-                "month": month,
-                "organic": int(base_organic * variation * growth_factor),
-                "direct": int(base_direct * variation * growth_factor),
-                "referral": int(base_referral * variation * growth_factor)
-            })
-            growth_factor *= 1.02  # 2% monthly growth
+        rows = _traffic_kernel(base_organic, base_direct, base_referral, domain_hash)
+        organic, direct, referral = (list(column) for column in zip(*rows))
         
-        return result
+        return {"month": list(TREND_MONTHS), "organic": organic, "direct": direct, "referral": referral}
+    
+    def _generate_mock_traffic_trend_for_domain(self, domain: str) -> List[Dict[str, Any]]:
+        """Generate domain-specific mock traffic data based on domain characteristics"""
+        columns = self._generate_mock_traffic_trend_columnar(domain)
+        return [
+            {"month": month, "organic": organic, "direct": direct, "referral": referral}
+            for month, organic, direct, referral in zip(
+                columns["month"], columns["organic"], columns["direct"], columns["referral"]
+            )
+        ]
     
     def _generate_mock_backlink_data_for_domain(self, domain: str) -> Dict[str, Any]:
         """Generate domain-specific mock backlink data"""
-        import hashlib
-        
-        domain_hash = int(hashlib.md5(domain.encode()).hexdigest()[:8], 16)
-        domain_lower = domain.lower()
+        domain_hash, _, brand = _domain_fingerprint(domain)
         
         # Determine metrics based on known domains
-        if 'amazon' in domain_lower:
-            referring_domains = 520000
-            total_backlinks = 85000000
-            authority_score = 96
-            traffic = "89M"
-            keywords = "4.2M"
-        elif 'flipkart' in domain_lower:
-            referring_domains = 195000
-            total_backlinks = 42000000
-            authority_score = 91
-            traffic = "52M"
-            keywords = "2.8M"
-        elif 'google' in domain_lower:
-            referring_domains = 2000000
-            total_backlinks = 500000000
-            authority_score = 99
-            traffic = "2.5B"
-            keywords = "15M"
+        known = KNOWN_DOMAIN_BACKLINKS.get(brand)
+        if known:
+            referring_domains, total_backlinks, authority_score, traffic, keywords = known
         else:
             referring_domains = 5000 + (domain_hash % 100000)
             total_backlinks = referring_domains * 15
@@ -823,15 +1219,10 @@ Return JSON format:
             keywords = f"{referring_domains // 50}K"
         
         # Generate monthly growth
-        base_domains = int(referring_domains * 0.9)
-        months = ["Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
-        monthly_growth = []
-        
-        for i, month in enumerate(months):
-            monthly_growth.append({
-                "month": month,
-                "domains": base_domains + int((referring_domains - base_domains) * i / 5)
-            })
+        monthly_growth = [
+            {"month": month, "domains": domains}
+            for month, domains in zip(TREND_MONTHS, _backlink_growth_kernel(referring_domains))
+        ]
         
         return {
             "referring_domains": referring_domains,
@@ -0,0 +1,115 @@
+"""
+API Cache - shared response cache for slow, rate-limited upstream APIs
+Redis-backed when REDIS_URL is set and the redis package is installed,
+in-process otherwise. Entries outlive their TTL so that an upstream failure
+can fall back to the last good result.
+"""
+
+import hashlib
+import logging
+import time
+from importlib.util import find_spec
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import orjson
+from cachetools import TLRUCache
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# How long an expired entry is kept as a fallback for upstream failures
+STALE_RETENTION_SECONDS = 7 * 86400
+
+KEY_PREFIX = "api_cache"
+
+# In-process store; each entry lives for its own TTL plus the stale retention
+_local = TLRUCache(maxsize=4096, ttu=lambda _key, entry, now: now + entry["ttl"] + STALE_RETENTION_SECONDS)
+_redis = None
+
+
+def _get_redis():
+    """Shared redis.asyncio client, or None when Redis is not configured"""
+    global _redis
+    if _redis is None and settings.REDIS_URL and find_spec("redis") is not None:
+        import redis.asyncio as aioredis
+        _redis = aioredis.from_url(settings.REDIS_URL)
+        logger.info("✅ API cache backed by Redis")
+    return _redis
+
+
+async def close_api_cache():
+    """Close the Redis connection pool, if one was opened"""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+
+
+def cache_key(endpoint: str, params: Any) -> str:
+    """Stable key for an endpoint and its (JSON-serialisable) parameters"""
+    digest = hashlib.sha1(orjson.dumps(params, default=str, option=orjson.OPT_SORT_KEYS)).hexdigest()
+    return f"{KEY_PREFIX}:{endpoint}:{digest}"
+
+
+async def _load(key: str) -> Optional[Dict[str, Any]]:
+    redis = _get_redis()
+    if redis is None:
+        return _local.get(key)
+    try:
+        raw = await redis.get(key)
+        return orjson.loads(raw) if raw else None
+    except Exception as e:
+        logger.warning(f"API cache read failed for {key}: {e}")
+        return None
+
+
+async def _store(key: str, entry: Dict[str, Any]):
+    redis = _get_redis()
+    if redis is None:
+        _local[key] = entry
+        return
+    try:
+        await redis.set(key, orjson.dumps(entry, default=str), ex=int(entry["ttl"] + STALE_RETENTION_SECONDS))
+    except Exception as e:
+        logger.warning(f"API cache write failed for {key}: {e}")
+
+
+def _stale(entry: Dict[str, Any]) -> Any:
+    body = entry["body"]
+    return {**body, "stale": True} if isinstance(body, dict) else body
+
+
+async def get_or_fetch(
+    endpoint: str,
+    params: Any,
+    ttl: float,
+    fetcher: Callable[[], Awaitable[Any]],
+    cacheable: Callable[[Any], bool] = bool
+) -> Any:
+    """
+    Return the cached result for (endpoint, params) if it is younger than ttl,
+    otherwise await fetcher() and cache its result when cacheable(result).
+    If the fetch raises or returns an uncacheable (failed) result and an
+    expired entry exists, that entry is returned instead, marked "stale": true.
+    """
+    key = cache_key(endpoint, params)
+    entry = await _load(key)
+    if entry is not None and time.time() < entry["stale_after"]:
+        return entry["body"]
+
+    try:
+        result = await fetcher()
+    except Exception as e:
+        if entry is None:
+            raise
+        logger.warning(f"{endpoint} failed ({e}), serving stale cached result")
+        return _stale(entry)
+
+    if cacheable(result):
+        now = time.time()
+        await _store(key, {"body": result, "fetched_at": now, "stale_after": now + ttl, "ttl": ttl})
+    elif entry is not None:
+        logger.warning(f"{endpoint} returned no usable data, serving stale cached result")
+        return _stale(entry)
+    return result
@@ -2,37 +2,211 @@
 Competitive Intelligence Service - Competitor analysis and comparison
 """
 
-from typing import Dict, Any, List
-from openai import AsyncOpenAI
+from typing import AsyncIterator, Dict, Any, List, Tuple
+from collections import defaultdict, deque
+from importlib.util import find_spec
+import asyncio
 import logging
+import math
 import json
 import httpx
+from cachetools import TTLCache
 
 from app.core.config import settings
-from app.utils.helpers import extract_json
+from app.core.openai_client import get_openai_client
+from app.utils.helpers import JSONObjectStream, extract_json
 
 logger = logging.getLogger(__name__)
 
+# Prompt templates (str.format placeholders; literal braces doubled)
+_PROMPT_COMPARE = """Compare these domains: Your site: {your_domain}, Competitors: {competitors}
+
+Return JSON:
+{{"your_domain": "{your_domain}",
+"comparison": [
+    {{"domain": "<domain>", "authority_estimate": <0-100>, "traffic_estimate": "<level>", 
+    "content_quality": <0-100>, "seo_strength": <0-100>}}
+],
+"your_position": <rank number>,
+"key_differentiators": [<list>],
+"gaps_to_close": [<list>],
+"action_items": [<prioritized list>]}}"""
+
+_PROMPT_GAPS = """Identify content gaps between {your_domain} and competitors: {competitor_domains}
+
+Return JSON:
+{{"your_domain": "{your_domain}",
+"content_gaps": [
+    {{"topic": "<topic>", "opportunity_score": <0-100>, "competitors_covering": [<domains>],
+    "recommended_content_type": "<type>", "priority": "<high/medium/low>"}}
+],
+"quick_wins": [<easy topics to cover>],
+"strategic_opportunities": [<long-term topics>]}}"""
+
+_PROMPT_TRAFFIC = """Estimate traffic metrics for: {domain}
+
+Return JSON:
+{{"domain": "{domain}",
+"monthly_visits_estimate": <number>,
+"traffic_trend": "<growing/stable/declining>",
+"top_traffic_sources": [<"organic", "direct", "referral", "social">],
+"geographic_distribution": [<top countries>],
+"mobile_vs_desktop": {{"mobile": <percent>, "desktop": <percent>}}}}"""
+
+_PROMPT_BACKLINKS = """Analyze backlink profile for: {domain}
+
+Return JSON:
+{{"domain": "{domain}",
+"backlinks_estimate": <number>,
+"referring_domains_estimate": <number>,
+"domain_authority_estimate": <0-100>,
+"link_quality": "<high/medium/low>",
+"anchor_text_distribution": {{"branded": <percent>, "keyword": <percent>, "generic": <percent>}},
+"top_referring_sources": [<list>],
+"link_building_opportunities": [<list>]}}"""
+
+_PROMPT_OPPORTUNITIES = """Based on REAL competitive analysis for "{domain}":
+- Calculated Authority: {authority}/100
+- PageSpeed Performance: {performance}/100
+
+Provide 3-4 specific competitive opportunities/weaknesses to exploit.
+Return JSON: {{"opportunities": ["action 1", "action 2", ...]}}"""
+
+_PROMPT_FULL = """Analyze {domain} against competitors: {competitors}
+
+Return one JSON object with exactly these top-level keys:
+{{"comparison": {{"your_domain": "{domain}",
+    "comparison": [{{"domain": "<domain>", "authority_estimate": <0-100>, "traffic_estimate": "<level>",
+        "content_quality": <0-100>, "seo_strength": <0-100>}}],
+    "your_position": <rank number>, "key_differentiators": [<list>],
+    "gaps_to_close": [<list>], "action_items": [<prioritized list>]}},
+"content_gaps": {{"your_domain": "{domain}",
+    "content_gaps": [{{"topic": "<topic>", "opportunity_score": <0-100>, "competitors_covering": [<domains>],
+        "recommended_content_type": "<type>", "priority": "<high/medium/low>"}}],
+    "quick_wins": [<easy topics to cover>], "strategic_opportunities": [<long-term topics>]}},
+"traffic": {{"domain": "{domain}", "monthly_visits_estimate": <number>,
+    "traffic_trend": "<growing/stable/declining>", "top_traffic_sources": [<"organic", "direct", "referral", "social">],
+    "geographic_distribution": [<top countries>], "mobile_vs_desktop": {{"mobile": <percent>, "desktop": <percent>}}}},
+"backlinks": {{"domain": "{domain}", "backlinks_estimate": <number>, "referring_domains_estimate": <number>,
+    "domain_authority_estimate": <0-100>, "link_quality": "<high/medium/low>",
+    "anchor_text_distribution": {{"branded": <percent>, "keyword": <percent>, "generic": <percent>}},
+    "top_referring_sources": [<list>], "link_building_opportunities": [<list>]}}}}"""
+
+
+# Completions observed per endpoint before max_tokens switches from the ceiling to the p95-based cap
+ADAPTIVE_MIN_SAMPLES = 20
+
+# Labels for the analyze_competitor gather, in task order
+COMPETITOR_SOURCES = ("pagespeed", "security", "tech_stack", "serp", "history", "authority")
+
+
+def _domain_key(domain: str) -> str:
+    """Bare lower-case host of a domain or URL, used as a cache key"""
+    return domain.replace('https://', '').replace('http://', '').replace('www.', '').split('/')[0].lower()
+
+
+def _slot(result: Any, default: Any, name: str) -> Any:
+    """Return a gather() result, or the default (logging the failure) if the call raised"""
+    if isinstance(result, Exception):
+        logger.warning(f"Competitor source '{name}' failed: {result!r}")
+        return default
+    return result
+
 
 class CompetitiveIntelService:
     """Competitive analysis and intelligence service"""
     
     def __init__(self):
         self._client = None
+        # Shared connection pool for the external data sources (PageSpeed, OpenPageRank, site fetches)
+        self._http = httpx.AsyncClient(
+            http2=find_spec("h2") is not None,
+            timeout=10.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+        )
+        # Fused analyze_full results keyed by (domain, competitors)
+        self._full_cache = TTLCache(maxsize=256, ttl=settings.CACHE_TTL_SECONDS)
+        # analyze_competitor results by normalized domain (15 minutes), with the
+        # in-flight analysis per domain so concurrent requests share one run
+        self._analysis_cache = TTLCache(maxsize=1024, ttl=900)
+        self._analysis_tasks: Dict[str, asyncio.Task] = {}
+        # Recent completion_tokens per endpoint, used to size max_tokens
+        self._completion_tokens: Dict[str, deque] = defaultdict(lambda: deque(maxlen=200))
     
     @property
     def client(self):
         """Lazy initialization of OpenAI client"""
         if self._client is None and settings.OPENAI_API_KEY:
-            self._client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+            self._client = get_openai_client()
             logger.info("OpenAI client initialized for CompetitiveIntel")
         return self._client
     
+    def _token_cap(self, endpoint: str, ceiling: int) -> int:
+        """max_tokens for an endpoint: 1.2x the rolling p95 of observed completion sizes, never above the ceiling"""
+        samples = self._completion_tokens[endpoint]
+        if len(samples) < ADAPTIVE_MIN_SAMPLES:
+            return ceiling
+        ordered = sorted(samples)
+        p95 = ordered[min(len(ordered) - 1, math.ceil(len(ordered) * 0.95) - 1)]
+        return min(ceiling, math.ceil(p95 * 1.2))
+    
+    async def _tracked_call(self, endpoint: str, max_tokens: int, **kwargs):
+        """
+        chat.completions.create with an adaptive max_tokens cap per endpoint.
+        max_tokens is the hard ceiling (and the cold-start value). A completion cut
+        off by the adaptive cap is retried once at the ceiling and resets the history.
+        """
+        cap = self._token_cap(endpoint, max_tokens)
+        response = await self.client.chat.completions.create(max_tokens=cap, **kwargs)
+        
+        if response.choices[0].finish_reason == "length":
+            logger.warning(f"Completion for '{endpoint}' truncated at max_tokens={cap}")
+            if cap < max_tokens:
+                self._completion_tokens[endpoint].clear()
+                response = await self.client.chat.completions.create(max_tokens=max_tokens, **kwargs)
+        
+        if response.usage:
+            self._completion_tokens[endpoint].append(response.usage.completion_tokens)
+        return response
+    
+    async def aclose(self):
+        """Close the shared HTTP connection pool"""
+        await self._http.aclose()
+    
     async def analyze_competitor(self, domain: str) -> Dict[str, Any]:
         """
         Analyze competitor using REAL data from PageSpeed and SERP.
         NO AI GUESSING for metrics - uses actual performance data.
+        Successful results are cached per domain for 15 minutes.
         """
+        key = _domain_key(domain)
+        if key in self._analysis_cache:
+            return self._analysis_cache[key]
+        
+        # Join the analysis already running for this domain, or start one; the
+        # task is shielded so one cancelled request does not cancel the others
+        task = self._analysis_tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._analyze_and_cache(key, domain))
+            self._analysis_tasks[key] = task
+            task.add_done_callback(lambda done: self._analysis_done(key, done))
+        return await asyncio.shield(task)
+    
+    async def _analyze_and_cache(self, key: str, domain: str) -> Dict[str, Any]:
+        result = await self._analyze_competitor(domain)
+        if result.get("data_source") != "fallback":
+            self._analysis_cache[key] = result
+        return result
+    
+    def _analysis_done(self, key: str, task: asyncio.Task):
+        """Forget a finished analysis, whether it succeeded, failed or was cancelled"""
+        if self._analysis_tasks.get(key) is task:
+            del self._analysis_tasks[key]
+        if not task.cancelled():
+            task.exception()
+    
+    async def _analyze_competitor(self, domain: str) -> Dict[str, Any]:
+        """Run the uncached competitor analysis"""
         from app.services.external_apis import external_apis
         
         try:
@@ -43,24 +217,24 @@ class CompetitiveIntelService:
                 url = domain
                 domain = domain.replace('https://', '').replace('http://', '').replace('www.', '').split('/')[0]
             
-            # 1. Get REAL PageSpeed metrics
-            pagespeed = await external_apis.get_pagespeed_metrics(url)
-            
-            # 2. Get REAL security headers
-            security = await external_apis.check_security_headers(url)
-            
-            # 3. Get REAL tech stack
-            tech_stack = await external_apis.get_tech_stack(url)
-            
-            # 4. Get REAL SERP presence
-            serp = await external_apis.get_ddg_research(domain)
+            # 1-6. Fetch REAL PageSpeed, security headers, tech stack, SERP presence,
+            # domain history and authority (OpenPageRank) concurrently
+            results = await asyncio.gather(
+                external_apis.get_pagespeed_metrics(url, client=self._http),
+                external_apis.check_security_headers(url, client=self._http),
+                external_apis.get_tech_stack(url, client=self._http),
+                external_apis.get_ddg_research(domain),
+                external_apis.get_wayback_history(url),
+                external_apis.get_domain_authority(domain, client=self._http),
+                return_exceptions=True
+            )
+            # A failed source only blanks its own slot
+            defaults = ({}, {}, {}, {"results": []}, {}, {})
+            pagespeed, security, tech_stack, serp, history, authority_data = (
+                _slot(result, default, name)
+                for result, default, name in zip(results, defaults, COMPETITOR_SOURCES)
+            )
             serp_presence = len(serp.get("results", []))
-            
-            # 5. Get REAL domain history
-            history = await external_apis.get_wayback_history(url)
-            
-            # 6. Get REAL Authority (OpenPageRank)
-            authority_data = await external_apis.get_domain_authority(domain)
             opr_score = authority_data.get("domain_authority", 0)
             
             # 6. CALCULATE authority from real data
@@ -138,23 +312,14 @@ class CompetitiveIntelService:
         if not self.client:
             return self._mock_comparison(your_domain, competitors)
         
-        prompt = f"""Compare these domains: Your site: {your_domain}, Competitors: {competitors}
-
-Return JSON:
-{{"your_domain": "{your_domain}",
-"comparison": [
-    {{"domain": "<domain>", "authority_estimate": <0-100>, "traffic_estimate": "<level>", 
-    "content_quality": <0-100>, "seo_strength": <0-100>}}
-],
-"your_position": <rank number>,
-"key_differentiators": [<list>],
-"gaps_to_close": [<list>],
-"action_items": [<prioritized list>]}}"""
+        prompt = self._compare_prompt(your_domain, competitors)
 
         try:
-            response = await self.client.chat.completions.create(
+            response = await self._tracked_call(
+                "compare",
                 model=settings.OPENAI_MODEL,
                 messages=[{"role": "user", "content": prompt}],
+                response_format={"type": "json_object"},
                 max_tokens=2000
             )
             return extract_json(response.choices[0].message.content)
@@ -167,21 +332,14 @@ Return JSON:
         if not self.client:
             return self._mock_content_gaps(your_domain)
         
-        prompt = f"""Identify content gaps between {your_domain} and competitors: {competitor_domains}
-
-Return JSON:
-{{"your_domain": "{your_domain}",
-"content_gaps": [
-    {{"topic": "<topic>", "opportunity_score": <0-100>, "competitors_covering": [<domains>],
-    "recommended_content_type": "<type>", "priority": "<high/medium/low>"}}
-],
-"quick_wins": [<easy topics to cover>],
-"strategic_opportunities": [<long-term topics>]}}"""
+        prompt = self._content_gaps_prompt(your_domain, competitor_domains)
 
         try:
-            response = await self.client.chat.completions.create(
+            response = await self._tracked_call(
+                "content_gaps",
                 model=settings.OPENAI_MODEL,
                 messages=[{"role": "user", "content": prompt}],
+                response_format={"type": "json_object"},
                 max_tokens=2000
             )
             return extract_json(response.choices[0].message.content)
@@ -189,25 +347,83 @@ Return JSON:
             logger.error(f"Error finding content gaps: {e}")
             return self._mock_content_gaps(your_domain)
     
+    def _compare_prompt(self, your_domain: str, competitors: List[str]) -> str:
+        """Prompt shared by compare_domains and its streaming variant"""
+        return _PROMPT_COMPARE.format(your_domain=your_domain, competitors=competitors)
+    
+    def _content_gaps_prompt(self, your_domain: str, competitor_domains: List[str]) -> str:
+        """Prompt shared by find_content_gaps and its streaming variant"""
+        return _PROMPT_GAPS.format(your_domain=your_domain, competitor_domains=competitor_domains)
+    
+    async def stream_compare_domains(self, your_domain: str, competitors: List[str]) -> AsyncIterator[Tuple[str, Any]]:
+        """Streaming compare_domains: yields (section, value) pairs as each top-level JSON member completes"""
+        if not self.client:
+            for item in self._mock_comparison(your_domain, competitors).items():
+                yield item
+            return
+        
+        async for item in self._stream_json(
+            self._compare_prompt(your_domain, competitors), max_tokens=2000,
+            fallback=self._mock_comparison(your_domain, competitors)
+        ):
+            yield item
+    
+    async def stream_content_gaps(self, your_domain: str, competitor_domains: List[str]) -> AsyncIterator[Tuple[str, Any]]:
+        """Streaming find_content_gaps: yields (section, value) pairs as each top-level JSON member completes"""
+        if not self.client:
+            for item in self._mock_content_gaps(your_domain).items():
+                yield item
+            return
+        
+        async for item in self._stream_json(
+            self._content_gaps_prompt(your_domain, competitor_domains), max_tokens=2000,
+            fallback=self._mock_content_gaps(your_domain)
+        ):
+            yield item
+    
+    async def _stream_json(self, prompt: str, max_tokens: int, fallback: Dict[str, Any]) -> AsyncIterator[Tuple[str, Any]]:
+        """Stream a JSON-object completion, yielding top-level members as soon as they are complete"""
+        emitted = set()
+        try:
+            stream = await self.client.chat.completions.create(
+                model=settings.OPENAI_MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                response_format={"type": "json_object"},
+                max_tokens=max_tokens,
+                stream=True
+            )
+            parser = JSONObjectStream()
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                for key, value in parser.feed(chunk.choices[0].delta.content or ""):
+                    emitted.add(key)
+                    yield key, value
+            
+            # Pick up anything the incremental pass couldn't split out (e.g. fenced output)
+            for key, value in extract_json(parser.text).items():
+                if key not in emitted:
+                    emitted.add(key)
+                    yield key, value
+        except Exception as e:
+            logger.error(f"Error streaming completion: {e}")
+            for key, value in fallback.items():
+                if key not in emitted:
+                    yield key, value
+    
     async def estimate_traffic(self, domain: str) -> Dict[str, Any]:
         """Estimate domain traffic"""
         if not self.client:
             return {"domain": domain, "monthly_visits": 50000, "traffic_trend": "growing"}
         
-        prompt = f"""Estimate traffic metrics for: {domain}
-
-Return JSON:
-{{"domain": "{domain}",
-"monthly_visits_estimate": <number>,
-"traffic_trend": "<growing/stable/declining>",
-"top_traffic_sources": [<"organic", "direct", "referral", "social">],
-"geographic_distribution": [<top countries>],
-"mobile_vs_desktop": {{"mobile": <percent>, "desktop": <percent>}}}}"""
+        prompt = _PROMPT_TRAFFIC.format(domain=domain)
 
         try:
-            response = await self.client.chat.completions.create(
+            response = await self._tracked_call(
+                "traffic",
                 model=settings.OPENAI_MODEL,
                 messages=[{"role": "user", "content": prompt}],
+                response_format={"type": "json_object"},
                 max_tokens=800
             )
             return extract_json(response.choices[0].message.content)
@@ -220,22 +436,14 @@ Return JSON:
         if not self.client:
             return self._mock_backlinks(domain)
         
-        prompt = f"""Analyze backlink profile for: {domain}
-
-Return JSON:
-{{"domain": "{domain}",
-"backlinks_estimate": <number>,
-"referring_domains_estimate": <number>,
-"domain_authority_estimate": <0-100>,
-"link_quality": "<high/medium/low>",
-"anchor_text_distribution": {{"branded": <percent>, "keyword": <percent>, "generic": <percent>}},
-"top_referring_sources": [<list>],
-"link_building_opportunities": [<list>]}}"""
+        prompt = _PROMPT_BACKLINKS.format(domain=domain)
 
         try:
-            response = await self.client.chat.completions.create(
+            response = await self._tracked_call(
+                "backlinks",
                 model=settings.OPENAI_MODEL,
                 messages=[{"role": "user", "content": prompt}],
+                response_format={"type": "json_object"},
                 max_tokens=1000
             )
             return extract_json(response.choices[0].message.content)
@@ -243,6 +451,59 @@ Return JSON:
             logger.error(f"Error analyzing backlinks: {e}")
             return self._mock_backlinks(domain)
     
+    async def analyze_full(self, domain: str, competitors: List[str]) -> Dict[str, Any]:
+        """
+        Competitor analysis, comparison, content gaps, traffic and backlinks in one pass.
+        The four AI sections come from a single fused completion instead of four
+        round-trips; the real-data competitor analysis runs alongside it.
+        Results that fell back to mock data anywhere are not cached.
+        """
+        cache_key = (_domain_key(domain), tuple(_domain_key(c) for c in competitors))
+        if cache_key in self._full_cache:
+            return self._full_cache[cache_key]
+        
+        competitor, (ai_sections, ai_complete) = await asyncio.gather(
+            self.analyze_competitor(domain),
+            self._fused_ai_analysis(domain, competitors)
+        )
+        result = {"competitor": competitor, **ai_sections}
+        if ai_complete and competitor.get("data_source") != "fallback":
+            self._full_cache[cache_key] = result
+        return result
+    
+    async def _fused_ai_analysis(self, domain: str, competitors: List[str]) -> Tuple[Dict[str, Any], bool]:
+        """
+        Single completion returning the comparison, content_gaps, traffic and
+        backlinks sections, and whether all of them came from the model rather
+        than the mock fallbacks.
+        """
+        fallback = {
+            "comparison": self._mock_comparison(domain, competitors),
+            "content_gaps": self._mock_content_gaps(domain),
+            "traffic": {"domain": domain, "monthly_visits_estimate": 50000, "traffic_trend": "stable"},
+            "backlinks": self._mock_backlinks(domain)
+        }
+        if not self.client:
+            return fallback, False
+        
+        prompt = _PROMPT_FULL.format(domain=domain, competitors=competitors)
+
+        try:
+            response = await self._tracked_call(
+                "full",
+                model=settings.OPENAI_MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                response_format={"type": "json_object"},
+                max_tokens=4000
+            )
+            result = extract_json(response.choices[0].message.content)
+            # Keep whatever sections came back; fill the rest from the fallbacks
+            sections = {key: result.get(key) or default for key, default in fallback.items()}
+            return sections, all(result.get(key) for key in fallback)
+        except Exception as e:
+            logger.error(f"Error in fused competitive analysis: {e}")
+            return fallback, False
+    
     async def _get_competitive_opportunities(
         self, domain: str, authority: int, performance: float
     ) -> List[str]:
@@ -251,14 +512,10 @@ Return JSON:
             return []
         
         try:
-            prompt = f"""Based on REAL competitive analysis for "{domain}":
-- Calculated Authority: {authority}/100
-- PageSpeed Performance: {performance}/100
-
-Provide 3-4 specific competitive opportunities/weaknesses to exploit.
-Return JSON: {{"opportunities": ["action 1", "action 2", ...]}}"""
+            prompt = _PROMPT_OPPORTUNITIES.format(domain=domain, authority=authority, performance=performance)
 
-            response = await self.client.chat.completions.create(
+            response = await self._tracked_call(
+                "opportunities",
                 model=settings.OPENAI_MODEL,
                 messages=[{"role": "user", "content": prompt}],
                 response_format={"type": "json_object"},
@@ -2,91 +2,594 @@
 Content Intelligence Engine - AI-powered content creation and optimization
 """
 
-from typing import Dict, Any, List, Optional
-from openai import AsyncOpenAI
+from typing import AsyncIterator, Awaitable, Callable, Dict, Any, List, NamedTuple, Optional, Tuple
+from types import MappingProxyType
+import asyncio
+import hashlib
 import logging
 import json
+import math
+import random
 import re
+import time
+
+import httpx
+import orjson
+from cachetools import TTLCache
+from openai import AsyncOpenAI
 
 from app.core.config import settings
+from app.core.openai_client import RETRYABLE_OPENAI_ERRORS, get_openai_client, retry_openai
+from app.services.schema_builders import build_schema
 from app.utils.helpers import extract_json
 
 logger = logging.getLogger(__name__)
 
+_WORD_RE = re.compile(r"\S+")
+
+# Prompt templates keep the static instructions first and the request-specific
+# values last, so repeated calls share a cacheable prompt prefix
+_BRIEF_PROMPT_PREFIX = """Create a comprehensive content brief for the topic, target keyword and content type given at the end.
+
+Return JSON with:
+{"title": "<compelling title>", "meta_description": "<160 chars>",
+"outline": [{"section": "<name>", "points": [<list>]}...],
+"semantic_keywords": [<10-15 related keywords>],
+"questions_to_answer": [<5-7 questions>],
+"target_word_count": <number>,
+"tone": "<recommended tone>"}
+"""
+
+_CONTENT_PROMPT_PREFIX = """Write a comprehensive, SEO-optimized article about the topic given at the end, targeting its primary keyword and length.
+
+Include:
+- Engaging introduction
+- Clear section headings (H2, H3)
+- Naturally integrated keywords
+- Practical examples
+- Strong conclusion with CTA
+
+Write in a professional, engaging tone. Output the full article.
+"""
+
+_TITLES_PROMPT_PREFIX = """Generate SEO-optimized title tags for the keyword given at the end, as many as the count given.
+Each title should be:
+- Under 60 characters
+- Include the keyword naturally
+- Use power words for CTR
+
+Return a JSON object: {"titles": [{"title": "<title>", "length": <chars>, "power_words": [<list>]}]}
+"""
+
+_META_PROMPT_PREFIX = """Generate compelling meta descriptions for the keyword and context given at the end, as many as the count given.
+Requirements:
+- 150-160 characters
+- Include call-to-action
+- Compelling and click-worthy
+
+Return a JSON object: {"descriptions": [{"description": "<text>", "length": <chars>, "has_cta": true}]}
+"""
+
+_OUTLINE_PROMPT_PREFIX = """Create a detailed content outline for the topic and target keyword given at the end.
+
+Return JSON: {"topic": "<topic>", "sections": [{"heading": "<H2>", "subheadings": [<H3 list>], "key_points": [<list>]}]}
+"""
+
+_SCHEMA_PROMPT_PREFIX = """Generate valid JSON-LD schema markup for the schema type and data given at the end.
+
+Return the complete, valid JSON-LD schema as a JSON object.
+"""
+
+_REWRITE_PROMPT_PREFIX = """Rewrite the text given at the end following the instruction given with it.
+
+Return only the rewritten text.
+"""
+
+_IDEAS_PROMPT_PREFIX = """Generate unique, engaging article ideas for the topic given at the end, as many as the count given.
+
+Return a JSON object: {"ideas": [{"title": "<title>", "type": "<how-to/listicle/guide/comparison/case-study>", "target_audience": "<who>", "angle": "<unique angle>", "suggested_keyword": "<best primary keyword for SEO>"}]}
+"""
+
+_BUNDLE_PROMPT_PREFIX = """Plan content for the topic and target keyword given at the end: a content brief, a detailed outline, and as many related article ideas as the count given.
+
+Return a JSON object:
+{"brief": {"title": "<compelling title>", "meta_description": "<160 chars>",
+  "outline": [{"section": "<name>", "points": [<list>]}...],
+  "semantic_keywords": [<10-15 related keywords>],
+  "questions_to_answer": [<5-7 questions>],
+  "target_word_count": <number>,
+  "tone": "<recommended tone>"},
+"outline": {"topic": "<topic>", "sections": [{"heading": "<H2>", "subheadings": [<H3 list>], "key_points": [<list>]}]},
+"ideas": [{"title": "<title>", "type": "<how-to/listicle/guide/comparison/case-study>", "target_audience": "<who>", "angle": "<unique angle>", "suggested_keyword": "<best primary keyword for SEO>"}]}
+"""
+
+_SUMMARY_PROMPT_PREFIX = """Summarize the content given at the end in the length given with it.
+"""
+
+STYLE_PROMPTS = MappingProxyType({
+    "improve": "Improve clarity and engagement",
+    "simplify": "Simplify for easier reading",
+    "formal": "Make more formal and professional",
+    "casual": "Make more casual and conversational",
+    "expand": "Expand with more detail",
+    "condense": "Condense while keeping key points"
+})
+
+LENGTH_MAP = MappingProxyType({"short": "2-3 sentences", "medium": "1 paragraph", "long": "3-4 paragraphs"})
+
+
+def _brief_prompt(topic: str, keyword: str, content_type: str = "blog_post") -> str:
+    return _BRIEF_PROMPT_PREFIX + f"""
+Topic: "{topic}"
+Target keyword: {keyword}
+Content type: {content_type}"""
+
+
+def _bundle_prompt(topic: str, keyword: str, idea_count: int = 10) -> str:
+    return _BUNDLE_PROMPT_PREFIX + f"""
+Topic: "{topic}"
+Target keyword: {keyword}
+Count: {idea_count}"""
+
+
+def _content_prompt(topic: str, keyword: str, word_count: int = 1500) -> str:
+    return _CONTENT_PROMPT_PREFIX + f"""
+Topic: "{topic}"
+Primary keyword: {keyword}
+Target length: {word_count} words"""
+
+
+def _titles_prompt(keyword: str, count: int = 5) -> str:
+    return _TITLES_PROMPT_PREFIX + f"""
+Keyword: "{keyword}"
+Count: {count}"""
+
+
+def _meta_prompt(keyword: str, context: str = None, count: int = 5) -> str:
+    return _META_PROMPT_PREFIX + f"""
+Keyword: "{keyword}"
+Context: {context or 'General article'}
+Count: {count}"""
+
+
+def _outline_prompt(topic: str, keyword: str) -> str:
+    return _OUTLINE_PROMPT_PREFIX + f"""
+Topic: "{topic}"
+Target keyword: {keyword}"""
+
+
+def _ideas_prompt(topic: str, count: int = 10) -> str:
+    return _IDEAS_PROMPT_PREFIX + f"""
+Topic: "{topic}"
+Count: {count}"""
+
+
+def _rewrite_prompt(text: str, style: str = "improve") -> str:
+    return _REWRITE_PROMPT_PREFIX + f"""
+Instruction: {STYLE_PROMPTS.get(style, 'Improve')}
+Text:
+{text}"""
+
+
+def _summary_prompt(content: str, length: str = "medium") -> str:
+    return _SUMMARY_PROMPT_PREFIX + f"""
+Length: {LENGTH_MAP.get(length, '1 paragraph')}
+Content:
+{content}"""
+
+
+def _model(tier: str) -> str:
+    """Model for a task tier: "fast" for short outputs, "smart" for long-form writing"""
+    tiered = {"fast": settings.OPENAI_MODEL_FAST, "smart": settings.OPENAI_MODEL_SMART}.get(tier)
+    return tiered or settings.OPENAI_MODEL
+
+
+# max_tokens sized to the requested output rather than a fixed worst case
+def _content_tokens(word_count: int = 1500) -> int:
+    return min(4000, math.ceil(word_count * 1.5) + 100)
+
+
+def _titles_tokens(count: int = 5) -> int:
+    return min(800, count * 35 + 100)
+
+
+def _meta_tokens(count: int = 5) -> int:
+    return min(800, count * 70 + 100)
+
+
+def _ideas_tokens(count: int = 10) -> int:
+    return min(1500, count * 90 + 100)
+
+
+SUMMARY_MAX_TOKENS = {"short": 150, "medium": 300, "long": 500}
+
+# Inputs too short for an operation to be worth a completion; they are returned as-is
+REWRITE_MIN_WORDS = MappingProxyType({"condense": 50})
+SUMMARY_MIN_WORDS = 50
+
+
+def _skip_reason(text: str, min_words: int) -> Optional[str]:
+    """Why an input should not be sent to the model, or None if it should"""
+    if not text or not text.strip():
+        return "empty"
+    if min_words and len(text.split()) < min_words:
+        return "too_short"
+    return None
+
+
+# Articles larger than this are counted in a worker thread to keep the event loop free
+COUNT_STATS_THREAD_THRESHOLD = 10_000
+
+
+def _count_stats(content: str, keyword: str) -> Tuple[int, int]:
+    """(word count, keyword occurrences) with a single split and a single lowercase pass"""
+    return len(content.split()), content.lower().count(keyword.lower()) if keyword else 0
+
+
+class _Job(NamedTuple):
+    """A batch/bulk-capable generation task"""
+    build_prompt: Callable[..., str]
+    max_tokens: Callable[..., int]
+    method: str  # real-time method used when no API key is configured
+    result_key: Optional[str]  # key the JSON-mode response wraps a list result in
+    tier: str
+
+
+BATCH_JOBS = {
+    "brief": _Job(_brief_prompt, lambda **_: 2000, "generate_content_brief", None, "smart"),
+    "titles": _Job(_titles_prompt, lambda count=5, **_: _titles_tokens(count), "generate_titles", "titles", "fast"),
+    "meta": _Job(_meta_prompt, lambda count=5, **_: _meta_tokens(count), "generate_meta_descriptions", "descriptions", "fast"),
+    "outline": _Job(_outline_prompt, lambda **_: 1500, "create_outline", None, "default"),
+    "ideas": _Job(_ideas_prompt, lambda count=10, **_: _ideas_tokens(count), "generate_ideas", "ideas", "default"),
+}
+
+
+# Most items one bulk_generate call accepts; each is a completion behind the shared rate limiter
+BULK_MAX_ITEMS = 100
+
+BATCH_TERMINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+
+class _RateLimiter:
+    """Token bucket over requests and tokens per minute"""
+
+    def __init__(self, rpm: int, tpm: int):
+        self._capacity = (rpm, tpm)
+        self._available = [float(rpm), float(tpm)]
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int):
+        rpm, tpm = self._capacity
+        tokens = min(tokens, tpm)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                refill = (now - self._updated) / 60
+                self._updated = now
+                self._available = [min(cap, avail + cap * refill) for cap, avail in zip(self._capacity, self._available)]
+                if self._available[0] >= 1 and self._available[1] >= tokens:
+                    self._available[0] -= 1
+                    self._available[1] -= tokens
+                    return
+                await asyncio.sleep(max(
+                    (1 - self._available[0]) * 60 / rpm,
+                    (tokens - self._available[1]) * 60 / tpm
+                ))
+
 
 class ContentEngineService:
     """AI-powered content creation and optimization service"""
     
-    def __init__(self):
-        self._client = None
+    def __init__(self, client: Optional[AsyncOpenAI] = None):
+        # An injected client is used as-is; otherwise the shared pooled client is picked up lazily
+        self._client = client
+        # Exact tier: sha256(model, max_tokens, json_mode, prompt) -> completion text
+        self._completion_cache = TTLCache(maxsize=2048, ttl=settings.CONTENT_CACHE_TTL_SECONDS)
+        # Slot tier: (template_id, content slots) -> longest generated list, so a
+        # smaller `count` for the same keyword/topic is served by slicing
+        self._slot_cache = TTLCache(maxsize=1024, ttl=settings.CONTENT_CACHE_TTL_SECONDS)
+        self._rate_limiter = _RateLimiter(settings.OPENAI_MAX_RPM, settings.OPENAI_MAX_TPM)
     
     @property
     def client(self):
         """Lazy initialization of OpenAI client"""
         if self._client is None and settings.OPENAI_API_KEY:
-            self._client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+            self._client = get_openai_client()
             logger.info("OpenAI client initialized for ContentEngine")
         return self._client
 
+    async def aclose(self):
+        """Release the shared OpenAI client; its pool is closed by close_openai_client()"""
+        self._client = None
+
+    async def _complete(self, prompt: str, max_tokens: int, json_mode: bool = False,
+                        model: Optional[str] = None, hedge: bool = False, retry: bool = True,
+                        parse: Optional[Callable[[str], Any]] = None) -> Any:
+        """
+        Run a single-prompt completion through the exact-match response cache.
+        `hedge` duplicates slow requests (see _hedged) for latency-sensitive calls.
+        `retry=False` makes a single attempt, for callers that retry themselves.
+        Only complete responses (finish_reason "stop") are cached; with `parse`,
+        the parsed text is returned and the response is cached only if it parses.
+        """
+        parse = parse or (lambda text: text)
+        model = model or settings.OPENAI_MODEL
+        key = self._cache_key(prompt, max_tokens, json_mode, model)
+        cached = self._completion_cache.get(key)
+        if cached is not None:
+            return parse(cached)
+
+        request = {"model": model, "messages": [{"role": "user", "content": prompt}], "max_tokens": max_tokens}
+        if json_mode:
+            request["response_format"] = {"type": "json_object"}
+        create = self._create if retry else self._create_once
+        if hedge:
+            response = await self._hedged(lambda: create(**request))
+        else:
+            response = await create(**request)
+        choice = response.choices[0]
+        result = parse(choice.message.content)
+        if choice.finish_reason == "stop":
+            self._completion_cache[key] = choice.message.content
+        return result
+
+    async def _hedged(self, make_request: Callable[[], Awaitable[Any]], delay: Optional[float] = None) -> Any:
+        """
+        Await make_request(); if it has not finished after `delay` seconds
+        (HEDGE_AFTER_SECONDS), start an identical second request and return
+        whichever succeeds first, cancelling the other.
+        """
+        delay = settings.HEDGE_AFTER_SECONDS if delay is None else delay
+        pending = {asyncio.ensure_future(make_request())}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return done.pop().result()
+            logger.info(f"Completion still running after {delay}s, sending hedge request")
+            pending.add(asyncio.ensure_future(make_request()))
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _create_once(self, **kwargs):
+        """chat.completions.create with the SDK's own retries disabled"""
+        return await self.client.with_options(max_retries=0).chat.completions.create(**kwargs)
+
+    # _create_once with backoff on transient errors (replacing the SDK's own retries)
+    _create = retry_openai()(_create_once)
+
+    @staticmethod
+    def _cache_key(prompt: str, max_tokens: int, json_mode: bool, model: str) -> str:
+        return hashlib.sha256(f"{model}|{max_tokens}|{json_mode}|{prompt}".encode()).hexdigest()
+
+    async def _stream_text(self, prompt: str, max_tokens: int, model: Optional[str] = None) -> AsyncIterator[str]:
+        """Stream a plain-text completion as content deltas, sharing the exact-tier cache"""
+        model = model or settings.OPENAI_MODEL
+        key = self._cache_key(prompt, max_tokens, False, model)
+        cached = self._completion_cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        stream = await self._create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=max_tokens,
+            stream=True
+        )
+        parts = []
+        finish_reason = None
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield delta
+            finish_reason = chunk.choices[0].finish_reason or finish_reason
+        # A reply cut off by max_tokens is not worth serving again
+        if finish_reason == "stop":
+            self._completion_cache[key] = "".join(parts)
+
+    async def _complete_json(self, prompt: str, max_tokens: int, key: Optional[str] = None,
+                             model: Optional[str] = None, hedge: bool = False, retry: bool = True) -> Any:
+        """JSON-mode completion, parsed; `key` unwraps a list the model returned inside an object"""
+        def parse(text: str) -> Any:
+            data = extract_json(text)
+            return data[key] if key else data
+
+        return await self._complete(prompt, max_tokens, json_mode=True, model=model, hedge=hedge, retry=retry,
+                                    parse=parse)
+
+    def batch_request(self, custom_id: str, kind: str, **kwargs) -> Tuple[str, Dict[str, Any]]:
+        """Build one (custom_id, body) Batch API entry for a BATCH_JOBS kind"""
+        job = BATCH_JOBS[kind]
+        return custom_id, {
+            "model": _model(job.tier),
+            "messages": [{"role": "user", "content": job.build_prompt(**kwargs)}],
+            "max_tokens": job.max_tokens(**kwargs),
+            "response_format": {"type": "json_object"}
+        }
+
+    async def submit_batch(self, requests: List[Tuple[str, Dict[str, Any]]]) -> str:
+        """
+        Submit chat completions to the OpenAI Batch API (half price, results
+        within 24h) and return the batch id. For non-interactive bulk jobs only.
+        """
+        lines = b"\n".join(
+            orjson.dumps({"custom_id": custom_id, "method": "POST", "url": "/v1/chat/completions", "body": body})
+            for custom_id, body in requests
+        )
+        upload = await self.client.files.create(file=("content_batch.jsonl", lines), purpose="batch")
+        # The pinned SDK has no batches resource, so call the endpoint directly
+        response = await self.client.post(
+            "/batches",
+            cast_to=httpx.Response,
+            body={"input_file_id": upload.id, "endpoint": "/v1/chat/completions", "completion_window": "24h"}
+        )
+        batch_id = response.json()["id"]
+        logger.info(f"Submitted content batch {batch_id} with {len(requests)} requests")
+        return batch_id
+
+    async def wait_for_batch(self, batch_id: str, poll_interval: float = 30, max_interval: float = 600) -> Dict[str, Any]:
+        """
+        Poll a batch with exponential backoff until it finishes.
+        Returns {custom_id: parsed JSON object or None on per-request failure};
+        list kinds come back wrapped under their BATCH_JOBS key.
+        """
+        while True:
+            response = await self.client.get(f"/batches/{batch_id}", cast_to=httpx.Response)
+            batch = response.json()
+            if batch["status"] in BATCH_TERMINAL_STATUSES:
+                break
+            await asyncio.sleep(poll_interval)
+            poll_interval = min(poll_interval * 2, max_interval)
+
+        if not batch.get("output_file_id"):
+            raise RuntimeError(f"Batch {batch_id} ended with status {batch['status']}")
+
+        output = await self.client.files.content(batch["output_file_id"])
+        results = {}
+        for line in output.text.splitlines():
+            if not line:
+                continue
+            entry = orjson.loads(line)
+            try:
+                text = entry["response"]["body"]["choices"][0]["message"]["content"]
+                results[entry["custom_id"]] = extract_json(text)
+            except Exception as e:
+                logger.warning(f"Batch {batch_id} entry {entry.get('custom_id')} failed: {e}")
+                results[entry["custom_id"]] = None
+        return results
+
+    async def run_batch(self, requests: List[Tuple[str, Dict[str, Any]]], **poll_kwargs) -> Dict[str, Any]:
+        """Submit a batch and wait for its results"""
+        batch_id = await self.submit_batch(requests)
+        return await self.wait_for_batch(batch_id, **poll_kwargs)
+
+    async def bulk_generate(self, kind: str, items: List[Dict[str, Any]], max_concurrent: int = 10) -> List[Any]:
+        """
+        Run up to BULK_MAX_ITEMS BATCH_JOBS requests concurrently within
+        OPENAI_MAX_RPM/TPM. Results come back in input order; failed items,
+        including items with missing or unknown arguments, are None.
+        """
+        if len(items) > BULK_MAX_ITEMS:
+            raise ValueError(f"bulk_generate accepts at most {BULK_MAX_ITEMS} items, got {len(items)}")
+        job = BATCH_JOBS[kind]
+
+        # Index -> (prompt, max_tokens) for the items whose arguments fit the job
+        requests = {}
+        for index, item in enumerate(items):
+            try:
+                requests[index] = (job.build_prompt(**item), job.max_tokens(**item))
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Skipping invalid {kind} bulk item {index}: {e}")
+
+        if not self.client:
+            done = await asyncio.gather(
+                *(getattr(self, job.method)(**items[index]) for index in requests), return_exceptions=True
+            )
+        else:
+            model = _model(job.tier)
+            done = await self._bulk(
+                [
+                    # _bulk retries each request itself, behind the rate limiter
+                    lambda prompt=prompt, budget=budget: self._complete_json(
+                        prompt, budget, key=job.result_key, model=model, retry=False
+                    )
+                    for prompt, budget in requests.values()
+                ],
+                # Rough token estimate: ~4 chars per prompt token plus the completion budget
+                [len(prompt) // 4 + budget for prompt, budget in requests.values()],
+                max_concurrent
+            )
+
+        results = [None] * len(items)
+        for index, result in zip(requests, done):
+            results[index] = None if isinstance(result, Exception) else result
+        return results
+
+    async def _bulk(self, coro_factories: List[Callable[[], Awaitable[Any]]], token_estimates: List[int],
+                    max_concurrent: int = 10, max_retries: int = 5) -> List[Any]:
+        """
+        Await coroutine factories concurrently behind a semaphore and the
+        shared rate limiter, retrying 429/5xx/connection errors with jittered
+        exponential backoff. Exceptions are returned in place of results.
+        """
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def run(factory, tokens):
+            async with semaphore:
+                for attempt in range(max_retries + 1):
+                    await self._rate_limiter.acquire(tokens)
+                    try:
+                        return await factory()
+                    except RETRYABLE_OPENAI_ERRORS as e:
+                        if attempt == max_retries:
+                            raise
+                        delay = min(60, 2 ** attempt) * (0.5 + random.random())
+                        logger.warning(f"Retrying bulk request in {delay:.1f}s: {e}")
+                        await asyncio.sleep(delay)
+
+        return await asyncio.gather(
+            *(run(factory, tokens) for factory, tokens in zip(coro_factories, token_estimates)),
+            return_exceptions=True
+        )
+
+    def _slot_lookup(self, template_id: str, slots: tuple, count: int) -> Optional[List[Dict[str, Any]]]:
+        """First `count` items of a cached list for the same template and content slots"""
+        items = self._slot_cache.get((template_id, slots))
+        if items and len(items) >= count:
+            return items[:count]
+        return None
+
+    def _slot_store(self, template_id: str, slots: tuple, items: Any):
+        """Remember a generated list if it is longer than what is already cached"""
+        if not isinstance(items, list):
+            return
+        cached = self._slot_cache.get((template_id, slots))
+        if cached is None or len(items) > len(cached):
+            self._slot_cache[(template_id, slots)] = items
     
     async def generate_content_brief(self, topic: str, keyword: str, content_type: str = "blog_post") -> Dict[str, Any]:
         """Generate comprehensive content brief"""
         if not self.client:
             return self._mock_brief(topic, keyword)
         
-        prompt = f"""Create a comprehensive content brief for: "{topic}"
-Target keyword: {keyword}
-Content type: {content_type}
-
-Return JSON with:
-{{"title": "<compelling title>", "meta_description": "<160 chars>",
-"outline": [{{"section": "<name>", "points": [<list>]}}...],
-"semantic_keywords": [<10-15 related keywords>],
-"questions_to_answer": [<5-7 questions>],
-"target_word_count": <number>,
-"tone": "<recommended tone>"}}"""
+        prompt = _brief_prompt(topic, keyword, content_type)
 
         try:
-            response = await self.client.chat.completions.create(
-                model=settings.OPENAI_MODEL,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=2000
-            )
-            return extract_json(response.choices[0].message.content)
+            return await self._complete_json(prompt, 2000, model=_model("smart"), hedge=True)
         except Exception as e:
             logger.error(f"Error generating brief: {e}")
             return self._mock_brief(topic, keyword)
     
     async def create_content(self, topic: str, keyword: str, word_count: int = 1500) -> Dict[str, Any]:
         """Generate full content article"""
-        if not self.client:
+        if not self.client or _skip_reason(topic, 0):
             return self._mock_content(topic)
         
-        prompt = f"""Write a comprehensive, SEO-optimized article about: "{topic}"
-Primary keyword: {keyword}
-Target length: {word_count} words
-
-Include:
-- Engaging introduction
-- Clear section headings (H2, H3)
-- Naturally integrated keywords
-- Practical examples
-- Strong conclusion with CTA
-
-Write in a professional, engaging tone. Output the full article."""
+        prompt = _content_prompt(topic, keyword, word_count)
 
         try:
-            response = await self.client.chat.completions.create(
-                model=settings.OPENAI_MODEL,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=4000
-            )
-            content = response.choices[0].message.content
-            
+            text = await self._complete(prompt, _content_tokens(word_count), model=_model("smart"))
+            if len(text) > COUNT_STATS_THREAD_THRESHOLD:
+                word_count, keyword_hits = await asyncio.to_thread(_count_stats, text, keyword)
+            else:
+                word_count, keyword_hits = _count_stats(text, keyword)
             return {
-                "content": content,
-                "word_count": len(content.split()),
-                "keyword_density": content.lower().count(keyword.lower()) / len(content.split()) * 100
+                "content": text,
+                "word_count": word_count,
+                "keyword_density": keyword_hits / word_count * 100 if word_count else 0
             }
         except Exception as e:
             logger.error(f"Error creating content: {e}")
@@ -97,21 +600,16 @@ Write in a professional, engaging tone. Output the full article."""
         if not self.client:
             return [{"title": f"Best {keyword} Guide 2024", "length": 25, "power_words": ["Best"]}]
         
-        prompt = f"""Generate {count} SEO-optimized title tags for keyword: "{keyword}"
-Each title should be:
-- Under 60 characters
-- Include the keyword naturally
-- Use power words for CTR
-
-Return JSON array: [{{"title": "<title>", "length": <chars>, "power_words": [<list>]}}]"""
+        cached = self._slot_lookup("titles", (keyword,), count)
+        if cached is not None:
+            return cached
+        
+        prompt = _titles_prompt(keyword, count)
 
         try:
-            response = await self.client.chat.completions.create(
-                model=settings.OPENAI_MODEL,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=800
-            )
-            return extract_json(response.choices[0].message.content)
+            titles = await self._complete_json(prompt, _titles_tokens(count), key="titles", model=_model("fast"))
+            self._slot_store("titles", (keyword,), titles)
+            return titles
         except Exception as e:
             logger.error(f"Error generating titles: {e}")
             return [{"title": f"{keyword} - Complete Guide", "length": 30}]
@@ -121,22 +619,16 @@ Return JSON array: [{{"title": "<title>", "length": <chars>, "power_words": [<li
         if not self.client:
             return [{"description": f"Discover everything about {keyword}. Expert tips and guides.", "length": 60}]
         
-        prompt = f"""Generate {count} compelling meta descriptions for keyword: "{keyword}"
-Context: {context or 'General article'}
-Requirements:
-- 150-160 characters
-- Include call-to-action
-- Compelling and click-worthy
-
-Return JSON array: [{{"description": "<text>", "length": <chars>, "has_cta": true}}]"""
+        cached = self._slot_lookup("meta", (keyword, context), count)
+        if cached is not None:
+            return cached
+        
+        prompt = _meta_prompt(keyword, context, count)
 
         try:
-            response = await self.client.chat.completions.create(
-                model=settings.OPENAI_MODEL,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=800
-            )
-            return extract_json(response.choices[0].message.content)
+            descriptions = await self._complete_json(prompt, _meta_tokens(count), key="descriptions", model=_model("fast"))
+            self._slot_store("meta", (keyword, context), descriptions)
+            return descriptions
         except Exception as e:
             logger.error(f"Error generating meta: {e}")
             return [{"description": f"Learn about {keyword}. Get expert insights.", "length": 45}]
@@ -146,39 +638,58 @@ Return JSON array: [{{"description": "<text>", "length": <chars>, "has_cta": tru
         if not self.client:
             return {"topic": topic, "sections": [{"heading": "Introduction", "subheadings": []}]}
         
-        prompt = f"""Create a detailed content outline for: "{topic}"
-Target keyword: {keyword}
-
-Return JSON: {{"topic": "<topic>", "sections": [{{"heading": "<H2>", "subheadings": [<H3 list>], "key_points": [<list>]}}]}}"""
+        prompt = _outline_prompt(topic, keyword)
 
         try:
-            response = await self.client.chat.completions.create(
-                model=settings.OPENAI_MODEL,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=1500
-            )
-            return extract_json(response.choices[0].message.content)
+            return await self._complete_json(prompt, 1500, hedge=True)
         except Exception as e:
             logger.error(f"Error creating outline: {e}")
             return {"topic": topic, "sections": []}
     
+    async def generate_brief_bundle(self, topic: str, keyword: str, idea_count: int = 10) -> Dict[str, Any]:
+        """
+        Brief, outline and article ideas for one topic in a single completion,
+        sharing one set of instructions and one round trip.
+        """
+        fallback = {
+            "brief": self._mock_brief(topic, keyword),
+            "outline": {"topic": topic, "sections": [{"heading": "Introduction", "subheadings": []}]},
+            "ideas": [{"title": f"How to Master {topic}", "type": "how-to", "suggested_keyword": f"mastering {topic}", "target_audience": "beginners", "angle": "step-by-step guide"}]
+        }
+        if not self.client:
+            return fallback
+
+        prompt = _bundle_prompt(topic, keyword, idea_count)
+        max_tokens = min(4000, 2000 + 1500 + _ideas_tokens(idea_count) - 100)
+
+        try:
+            bundle = await self._complete_json(prompt, max_tokens, model=_model("smart"))
+            # Keep whichever parts came back and fill any missing one from the fallback
+            return {part: bundle.get(part) or fallback[part] for part in fallback}
+        except Exception as e:
+            logger.error(f"Error generating brief bundle: {e}")
+            return fallback
+    
     async def generate_schema(self, schema_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Generate JSON-LD schema markup"""
+        # Common types are built deterministically; only the rest need the LLM
+        try:
+            schema = build_schema(schema_type, data)
+        except (AttributeError, TypeError) as e:
+            logger.warning(f"Schema builder failed for {schema_type}, falling back to LLM: {e}")
+            schema = None
+        if schema is not None:
+            return {"schema": schema, "html": f'<script type="application/ld+json">{json.dumps(schema)}</script>'}
+        
         if not self.client:
             return self._mock_schema(schema_type, data)
         
-        prompt = f"""Generate valid JSON-LD schema markup for type: {schema_type}
-Data provided: {json.dumps(data)}
-
-Return the complete, valid JSON-LD schema object."""
+        prompt = _SCHEMA_PROMPT_PREFIX + f"""
+Schema type: {schema_type}
+Data provided: {json.dumps(data)}"""
 
         try:
-            response = await self.client.chat.completions.create(
-                model=settings.OPENAI_MODEL,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=1000
-            )
-            schema = extract_json(response.choices[0].message.content)
+            schema = await self._complete_json(prompt, 1000)
             return {"schema": schema, "html": f'<script type="application/ld+json">{json.dumps(schema)}</script>'}
         except Exception as e:
             logger.error(f"Error generating schema: {e}")
@@ -186,31 +697,17 @@ Return the complete, valid JSON-LD schema object."""
     
     async def rewrite_content(self, text: str, style: str = "improve") -> Dict[str, Any]:
         """Rewrite content with specified style"""
+        skipped = _skip_reason(text, REWRITE_MIN_WORDS.get(style, 0))
+        if skipped:
+            return {"original": text, "rewritten": text, "style": style, "skipped": skipped}
         if not self.client:
             return {"original": text, "rewritten": text, "style": style}
         
-        style_prompts = {
-            "improve": "Improve clarity and engagement",
-            "simplify": "Simplify for easier reading",
-            "formal": "Make more formal and professional",
-            "casual": "Make more casual and conversational",
-            "expand": "Expand with more detail",
-            "condense": "Condense while keeping key points"
-        }
-        
-        prompt = f"""{style_prompts.get(style, 'Improve')}: 
-
-{text}
-
-Return only the rewritten text."""
+        prompt = _rewrite_prompt(text, style)
 
         try:
-            response = await self.client.chat.completions.create(
-                model=settings.OPENAI_MODEL,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=2000
-            )
-            return {"original": text, "rewritten": response.choices[0].message.content, "style": style}
+            rewritten = await self._complete(prompt, 2000)
+            return {"original": text, "rewritten": rewritten, "style": style}
         except Exception as e:
             logger.error(f"Error rewriting: {e}")
             return {"original": text, "rewritten": text, "error": str(e)}
@@ -220,42 +717,105 @@ Return only the rewritten text."""
         if not self.client:
             return [{"title": f"How to Master {topic}", "type": "how-to", "suggested_keyword": f"mastering {topic}", "target_audience": "beginners", "angle": "step-by-step guide"}]
         
-        prompt = f"""Generate {count} unique, engaging article ideas for topic: "{topic}"
-
-Return JSON array: [{{"title": "<title>", "type": "<how-to/listicle/guide/comparison/case-study>", "target_audience": "<who>", "angle": "<unique angle>", "suggested_keyword": "<best primary keyword for SEO>"}}]"""
+        cached = self._slot_lookup("ideas", (topic,), count)
+        if cached is not None:
+            return cached
+        
+        prompt = _ideas_prompt(topic, count)
 
         try:
-            response = await self.client.chat.completions.create(
-                model=settings.OPENAI_MODEL,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=1500
-            )
-            return extract_json(response.choices[0].message.content)
+            ideas = await self._complete_json(prompt, _ideas_tokens(count), key="ideas")
+            self._slot_store("ideas", (topic,), ideas)
+            return ideas
         except Exception as e:
             logger.error(f"Error generating ideas: {e}")
             return [{"title": f"Guide to {topic}", "type": "guide", "suggested_keyword": f"{topic} guide", "target_audience": "general", "angle": "overview"}]
     
     async def summarize_content(self, content: str, length: str = "medium") -> Dict[str, Any]:
         """Summarize content"""
+        skipped = _skip_reason(content, SUMMARY_MIN_WORDS)
+        if skipped:
+            return {"summary": content, "length": length, "skipped": skipped}
         if not self.client:
             return {"summary": content[:200] + "...", "length": length}
         
-        length_map = {"short": "2-3 sentences", "medium": "1 paragraph", "long": "3-4 paragraphs"}
-        
-        prompt = f"""Summarize this content in {length_map.get(length, '1 paragraph')}:
-
-{content}"""
+        prompt = _summary_prompt(content, length)
 
         try:
-            response = await self.client.chat.completions.create(
-                model=settings.OPENAI_MODEL,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=500
-            )
-            return {"summary": response.choices[0].message.content, "length": length}
+            text = await self._complete(prompt, SUMMARY_MAX_TOKENS.get(length, 300), model=_model("fast"))
+            return {"summary": text, "length": length}
         except Exception as e:
             return {"summary": content[:200] + "...", "error": str(e)}
     
+    async def stream_create_content(self, topic: str, keyword: str, word_count: int = 1500) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Streaming version of create_content: yields ("delta", {"text"}) events
+        as the article is generated, then ("done", {"word_count", "keyword_density"}).
+        """
+        if not self.client or _skip_reason(topic, 0):
+            yield "done", self._mock_content(topic)
+            return
+
+        words = keyword_hits = 0
+        needle = keyword.lower()
+        tail = ""
+        in_word = False
+        try:
+            prompt = _content_prompt(topic, keyword, word_count)
+            async for delta in self._stream_text(prompt, _content_tokens(word_count), model=_model("smart")):
+                # Running counts; a keyword split across deltas is caught via the carried tail
+                words += sum(1 for _ in _WORD_RE.finditer(delta)) - (in_word and not delta[0].isspace())
+                in_word = not delta[-1].isspace()
+                window = tail + delta.lower()
+                keyword_hits += window.count(needle) if needle else 0
+                tail = window[-(len(needle) - 1):] if len(needle) > 1 else ""
+                yield "delta", {"text": delta}
+        except Exception as e:
+            logger.error(f"Error streaming content: {e}")
+            yield "error", {"error": str(e)}
+            return
+
+        yield "done", {"word_count": words, "keyword_density": keyword_hits / words * 100 if words else 0}
+
+    async def stream_rewrite_content(self, text: str, style: str = "improve") -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Streaming version of rewrite_content: ("delta", {"text"}) events, then ("done", {"style"})"""
+        skipped = _skip_reason(text, REWRITE_MIN_WORDS.get(style, 0))
+        if skipped or not self.client:
+            yield "delta", {"text": text}
+            yield "done", {"style": style, "skipped": skipped} if skipped else {"style": style}
+            return
+
+        try:
+            async for delta in self._stream_text(_rewrite_prompt(text, style), 2000):
+                yield "delta", {"text": delta}
+        except Exception as e:
+            logger.error(f"Error streaming rewrite: {e}")
+            yield "error", {"error": str(e)}
+            return
+        yield "done", {"style": style}
+
+    async def stream_summarize_content(self, content: str, length: str = "medium") -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Streaming version of summarize_content: ("delta", {"text"}) events, then ("done", {"length"})"""
+        skipped = _skip_reason(content, SUMMARY_MIN_WORDS)
+        if skipped:
+            yield "delta", {"text": content}
+            yield "done", {"length": length, "skipped": skipped}
+            return
+        if not self.client:
+            yield "delta", {"text": content[:200] + "..."}
+            yield "done", {"length": length}
+            return
+
+        try:
+            prompt = _summary_prompt(content, length)
+            async for delta in self._stream_text(prompt, SUMMARY_MAX_TOKENS.get(length, 300), model=_model("fast")):
+                yield "delta", {"text": delta}
+        except Exception as e:
+            logger.error(f"Error streaming summary: {e}")
+            yield "error", {"error": str(e)}
+            return
+        yield "done", {"length": length}
+    
     def _mock_brief(self, topic: str, keyword: str) -> Dict[str, Any]:
         return {
             "title": f"Complete Guide to {topic}",
@@ -4,349 +4,644 @@ Handles connections to free tools: PageSpeed, Wayback Machine, SecurityHeaders,
 """
 
 import httpx
+import orjson
+import functools
 import logging
 import asyncio
-from typing import Dict, Any, Optional
+import re
+import time
+from datetime import datetime
+from importlib.util import find_spec
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional, Tuple
+from cachetools import TTLCache
 from app.core.config import settings
+from app.services.api_cache import get_or_fetch
 
 logger = logging.getLogger(__name__)
 
+# Results that describe a failure or an unfinished scan are never cached
+_UNCACHEABLE_SOURCES = frozenset({"error", "in_progress", "unavailable", "no_data"})
+
+
+def _cacheable(result: Dict[str, Any]) -> bool:
+    return (
+        bool(result) and "error" not in result
+        and result.get("data_source") not in _UNCACHEABLE_SOURCES
+        and result.get("results") != []
+    )
+
+
+def cached(ttl: int):
+    """
+    Cache an audit method's parsed result per arguments for `ttl` seconds in
+    the shared API cache, falling back to the last good result if the upstream
+    fails. The pooled `client` argument is not part of the key, and empty or
+    failed results are not stored.
+    """
+    def decorator(func):
+        endpoint = func.__name__
+
+        @functools.wraps(func)
+        async def wrapper(self, *args, client: Optional[httpx.AsyncClient] = None, **kwargs):
+            if client is not None:
+                fetch = lambda: func(self, *args, client=client, **kwargs)
+            else:
+                fetch = lambda: func(self, *args, **kwargs)
+            return await get_or_fetch(endpoint, [args, sorted(kwargs.items())], ttl, fetch, cacheable=_cacheable)
+
+        return wrapper
+    return decorator
+
+
+def _signatures(table):
+    """
+    Normalise {category: [(name, rules)]} where each rule is a needle or a tuple
+    of needles that must all appear. Single needles that contain a shorter
+    single needle of the same technology are dropped, since they can never
+    change the outcome.
+    """
+    compiled = {}
+    for category, entries in table.items():
+        compiled[category] = []
+        for name, rules in entries:
+            singles = [rule for rule in rules if isinstance(rule, str)]
+            kept = [
+                rule for rule in rules
+                if not isinstance(rule, str) or not any(other != rule and other in rule for other in singles)
+            ]
+            compiled[category].append((name, tuple(
+                frozenset(needle.encode() for needle in ((rule,) if isinstance(rule, str) else rule))
+                for rule in kept
+            )))
+    return compiled
+
+
+# HTML markers per technology, matched as bytes against the lowercased page prefix
+TECH_SIGNATURES = _signatures({
+    "cms": [
+        ("WordPress", ("wp-content", "wp-includes", "wordpress")),
+        ("Shopify", ("shopify", "cdn.shopify")),
+        ("Wix", ("wix", "wixsite")),
+        ("Squarespace", ("squarespace",)),
+        ("Drupal", ("drupal", "sites/all")),
+        ("Joomla", ("joomla",)),
+        ("Webflow", ("webflow",)),
+    ],
+    "analytics": [
+        ("Google Analytics", ("google-analytics", "gtag(", "ga(", "googletagmanager")),
+        ("Meta Pixel", ("fbevents.js", "facebook.net/en_us/fbevents")),
+        ("Hotjar", ("hotjar",)),
+        ("Segment", (("segment", "analytics.js"),)),
+        ("Mixpanel", ("mixpanel",)),
+        ("Amplitude", ("amplitude",)),
+    ],
+    "frameworks": [
+        ("Next.js", ("_next/", "__next", "next.js")),
+        ("React", ("react", "reactdom", "__react")),
+        ("Vue.js", ("vue", "__vue__")),
+        ("Angular", ("angular", "ng-version")),
+        ("Svelte", ("svelte",)),
+        ("Gatsby", ("gatsby",)),
+        ("Nuxt.js", ("nuxt",)),
+        ("Tailwind CSS", ("tailwind",)),
+        ("Bootstrap", ("bootstrap",)),
+    ],
+    "cdn": [
+        ("AWS CloudFront", ("amazonaws",)),
+        ("Vercel", ("vercel",)),
+        ("Azure CDN", ("azureedge",)),
+    ],
+})
+
+# CMS/analytics/framework markers live in <head> or early <body>; the tail adds nothing
+TECH_SCAN_BYTES = 256_000
+
+TECH_NEEDLES = frozenset(
+    needle
+    for signatures in TECH_SIGNATURES.values()
+    for _, rules in signatures
+    for rule in rules
+    for needle in rule
+)
+
+# With pyahocorasick installed all needles are found in one automaton pass over the
+# page; without it each needle is a separate (memchr-fast) bytes substring scan
+_TECH_AUTOMATON = None
+if find_spec("ahocorasick") is not None:
+    import ahocorasick
+    _TECH_AUTOMATON = ahocorasick.Automaton()
+    for _needle in TECH_NEEDLES:
+        _TECH_AUTOMATON.add_word(_needle.decode("latin-1"), _needle)
+    _TECH_AUTOMATON.make_automaton()
+
+
+def _find_needles(html: bytes) -> set:
+    """TECH_NEEDLES present in the lowercased page bytes"""
+    if _TECH_AUTOMATON is not None:
+        # latin-1 maps bytes 1:1 to code points, so offsets and needles line up
+        return {needle for _, needle in _TECH_AUTOMATON.iter(html.decode("latin-1"))}
+    return {needle for needle in TECH_NEEDLES if needle in html}
+
+# Server/Via header tokens that identify an edge network, and the vendor each belongs to
+CDN_TOKENS = {
+    "akamai": "akamai",
+    "akamaighost": "akamai",
+    "akamainetstorage": "akamai",
+    "cloudflare": "cloudflare",
+    "fastly": "fastly",
+    "vercel": "vercel",
+    "netlify": "netlify",
+    "cloudfront": "cloudfront",
+    "incapsula": "incapsula",
+}
+
+# How get_tech_stack reports each vendor (Incapsula is only an edge provider for the security check)
+CDN_LABELS = {
+    "akamai": "Akamai",
+    "cloudflare": "Cloudflare",
+    "fastly": "Fastly",
+    "vercel": "Vercel",
+    "netlify": "Netlify",
+    "cloudfront": "AWS CloudFront",
+}
+
+# Vendors get_tech_stack also recognises in the Via header; the rest only count in Server
+VIA_CDN_VENDORS = frozenset({"akamai", "fastly"})
+
+# check_security_headers reports the first of these found in the Server header, capitalised
+EDGE_PROVIDERS = ("akamai", "cloudflare", "fastly", "vercel", "netlify", "cloudfront", "incapsula")
+
+_HEADER_TOKEN_RE = re.compile(r"[a-z]+")
+
+
+def _cdn_vendors(value: str) -> list:
+    """CDN vendors named in a lowercased header value, in order of appearance"""
+    return [CDN_TOKENS[token] for token in _HEADER_TOKEN_RE.findall(value) if token in CDN_TOKENS]
+
+
+# Browser-like request headers for fetching audited pages
+PAGE_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
+}
+PAGE_CACHE_TTL_SECONDS = 60
+
+# Page prefixes larger than this are scanned in a worker thread to keep the event loop free
+TECH_SCAN_THREAD_THRESHOLD = 64_000
+
+
+def _scan_tech(body: bytes, resp_headers: httpx.Headers) -> Dict[str, list]:
+    """Technologies detected from the page body prefix and response headers"""
+    # Match on raw bytes: no charset decode, and one ASCII lowercase of the capped prefix
+    html = body.lower()
+    
+    # Each needle is looked for once, however many technologies reference it
+    found = _find_needles(html)
+    tech = {category: [] for category in TECH_SIGNATURES}
+    for category, signatures in TECH_SIGNATURES.items():
+        for name, rules in signatures:
+            if any(found.issuperset(rule) for rule in rules):
+                tech[category].append(name)
+    
+    # CDN detection: HTML markers came from the signature pass, headers add the rest
+    vendors = _cdn_vendors(resp_headers.get("server", "").lower())
+    vendors += [vendor for vendor in _cdn_vendors(resp_headers.get("via", "").lower()) if vendor in VIA_CDN_VENDORS]
+    if "cf-ray" in resp_headers:
+        vendors.append("cloudflare")
+    if "x-amz-cf-id" in resp_headers:
+        vendors.append("cloudfront")
+    for vendor in vendors:
+        label = CDN_LABELS.get(vendor)
+        if label and label not in tech["cdn"]:
+            tech["cdn"].append(label)
+    return tech
+
+
+# Only the category scores and field metrics are read from the Lighthouse report
+PAGESPEED_FIELDS = (
+    "lighthouseResult(categories(performance/score,accessibility/score,best-practices/score,seo/score)),"
+    "loadingExperience/metrics"
+)
+
+# SSL Labs polling: 5s, 10s, 20s, then 30s steps, giving up after ~90s of waiting
+SSL_POLL_INITIAL_DELAY = 5.0
+SSL_POLL_MAX_DELAY = 30.0
+SSL_POLL_BUDGET_SECONDS = 90.0
+
+# Audited security headers and their score weights, in report order
+SECURITY_HEADER_SPEC = (
+    ("Strict-Transport-Security", 30),
+    ("Content-Security-Policy", 35),
+    ("X-Frame-Options", 15),
+    ("X-Content-Type-Options", 10),
+    ("Permissions-Policy", 10),
+)
+SECURITY_TOTAL_WEIGHT = sum(weight for _, weight in SECURITY_HEADER_SPEC)
+
+# SSL Labs grade -> score; unknown grades score 50
+SSL_GRADE_SCORES = MappingProxyType({"A+": 100, "A": 95, "A-": 90, "B": 80, "C": 60, "D": 40, "E": 20, "F": 0})
+
+_DOMAIN_PREFIX_RE = re.compile(r"^(?:https?://)?(?:www\.)?", re.IGNORECASE)
+
+
+def _norm_domain(domain: str) -> str:
+    """Bare host from a domain or URL: no scheme, leading www. or path"""
+    return _DOMAIN_PREFIX_RE.sub("", domain, count=1).split("/", 1)[0]
+
+
+OPR_API_URL = "https://openpagerank.com/api/v1.0/getPageRank"
+# getPageRank accepts up to 100 domains[] per request
+OPR_BATCH_SIZE = 100
+
+
+def _parse_opr_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Authority result from one OpenPageRank response row"""
+    # Handle potential string/None values from API
+    page_rank_raw = row.get("page_rank_decimal")
+    rank_raw = row.get("rank")
+    
+    try:
+        page_rank = float(page_rank_raw) if page_rank_raw else 0
+    except (ValueError, TypeError):
+        page_rank = 0
+    
+    try:
+        rank = int(rank_raw) if rank_raw else 0
+    except (ValueError, TypeError):
+        rank = 0
+    
+    # Convert PageRank (0-10) to Authority (0-100)
+    # Formula: DA = PageRank * 10 + bonus for low rank
+    authority = min(100, int(page_rank * 10) + (10 if rank > 0 and rank < 1000000 else 0))
+    return {
+        "domain_authority": authority,
+        "page_rank": page_rank,
+        "global_rank": rank,
+        "data_source": "openpagerank",
+        "confidence": "high"
+    }
+
+
+# Regional domains that surface through localized routing and pollute English SEO research
+_DDG_BLACKLIST_RE = re.compile(r"(?:baidu\.com|zhihu\.com|qq\.com|163\.com|sohu\.com|sina\.com\.cn)", re.IGNORECASE)
+
+
+def _format_ddg_result(r: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalise a DDGS text result to title/url/description"""
+    return {
+        "title": r.get("title", "Untitled"),
+        "url": r.get("href", r.get("link", "#")),
+        "description": r.get("body", r.get("snippet", ""))
+    }
+
+
+# Upstream APIs guarded by a circuit breaker: after BREAKER_THRESHOLD consecutive
+# failures (transport errors, 5xx, 429) calls fail fast for BREAKER_COOLDOWN_SECONDS
+UPSTREAMS = ("pagespeed", "wayback", "opr", "commoncrawl", "ssllabs", "w3c")
+BREAKER_THRESHOLD = 3
+BREAKER_COOLDOWN_SECONDS = 60.0
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose breaker is open"""
+
+
+class _CircuitBreaker:
+    """Consecutive-failure breaker; after the cool-down one more failure re-opens it"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.failures = 0
+        self.open_until = 0.0
+
+    def allow(self) -> bool:
+        return time.monotonic() >= self.open_until
+
+    def record(self, ok: bool):
+        if ok:
+            self.failures = 0
+            return
+        self.failures += 1
+        if self.failures >= BREAKER_THRESHOLD:
+            self.open_until = time.monotonic() + BREAKER_COOLDOWN_SECONDS
+            logger.warning("%s circuit open for %.0fs after %s consecutive failures", self.name, BREAKER_COOLDOWN_SECONDS, self.failures)
+
+
+def _ddg_search(query: str) -> List[Dict[str, Any]]:
+    """Blocking DuckDuckGo search with the regional blacklist and an English retry"""
+    from duckduckgo_search import DDGS
+    with DDGS() as ddgs:
+        # 1. FORCE US-English search for high-fidelity SaaS/Marketing metrics
+        results = list(ddgs.text(query, region='us-en', max_results=15))
+        
+        # 2. BLACKLIST irrelevant regional domains for English queries
+        formatted_results = [
+            _format_ddg_result(r) for r in results
+            if not _DDG_BLACKLIST_RE.search(r.get("href") or r.get("link", ""))
+        ]
+        
+        # 3. RETRY with explicit language hints if we got filtered down too much
+        if len(formatted_results) < 3:
+            logger.warning("Insufficient English results for '%s', retrying with hints...", query)
+            refined_query = f"{query} in english"
+            retry_results = list(ddgs.text(refined_query, region='us-en', max_results=10))
+            formatted_results.extend(
+                _format_ddg_result(r) for r in retry_results
+                if not _DDG_BLACKLIST_RE.search(r.get("href") or r.get("link", ""))
+            )
+        
+        return formatted_results[:10]
+
+
 class ExternalAPIService:
     """Service to interact with free external SEO tools and APIs"""
 
-    async def get_pagespeed_metrics(self, url: str, strategy: str = "mobile") -> Dict[str, Any]:
+    def __init__(self):
+        # Authority and backlink samples change slowly; cache successful lookups per domain
+        self._authority_cache = TTLCache(maxsize=1024, ttl=settings.CACHE_TTL_SECONDS)
+        self._backlink_cache = TTLCache(maxsize=1024, ttl=6 * 3600)
+        # One breaker per rate-limited or slow upstream API
+        self._breakers = {name: _CircuitBreaker(name) for name in UPSTREAMS}
+        # Audited page (headers, body prefix) shared by the tech-stack and security checks
+        self._page_cache = TTLCache(maxsize=256, ttl=PAGE_CACHE_TTL_SECONDS)
+        self._page_fetches: Dict[str, asyncio.Task] = {}
+        # API keys are fixed for the process lifetime; resolve them once
+        self._opr_headers = {"API-OPR": settings.OPENPAGERANK_API_KEY} if getattr(settings, "OPENPAGERANK_API_KEY", None) else {}
+        self._pagespeed_key = getattr(settings, "PAGESPEED_API_KEY", None)
+        # Long-lived pool so repeated calls to the same APIs reuse keep-alive connections
+        self._client = httpx.AsyncClient(
+            http2=find_spec("h2") is not None,
+            timeout=httpx.Timeout(30.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30),
+            follow_redirects=True
+        )
+
+    async def aclose(self):
+        """Close the shared HTTP connection pool"""
+        await self._client.aclose()
+
+    async def _get(self, url: str, client: Optional[httpx.AsyncClient] = None, upstream: Optional[str] = None,
+                   timeout: float = 15, **kwargs) -> httpx.Response:
+        """
+        GET through the caller's pooled client, or the service's own pool if none is given.
+        Calls tagged with an upstream go through its circuit breaker and raise
+        CircuitOpenError instead of waiting out the timeout while it is open.
+        """
+        breaker = self._breakers[upstream] if upstream else None
+        if breaker and not breaker.allow():
+            raise CircuitOpenError(f"{upstream} circuit open")
+        try:
+            response = await (client or self._client).get(url, timeout=timeout, **kwargs)
+        except httpx.HTTPError:
+            if breaker:
+                breaker.record(False)
+            raise
+        if breaker:
+            breaker.record(response.status_code < 500 and response.status_code != 429)
+        return response
+
+    async def _get_prefix(self, url: str, client: Optional[httpx.AsyncClient] = None, max_bytes: int = TECH_SCAN_BYTES,
+                          timeout: float = 15, **kwargs) -> Tuple[httpx.Response, bytes]:
+        """
+        Streaming GET that stops reading the body after max_bytes.
+        Returns the response (status and headers) and the body prefix.
+        """
+        chunks, total = [], 0
+        async with (client or self._client).stream("GET", url, timeout=timeout, **kwargs) as response:
+            if max_bytes > 0:
+                async for chunk in response.aiter_bytes():
+                    chunks.append(chunk)
+                    total += len(chunk)
+                    if total >= max_bytes:
+                        break
+        return response, b"".join(chunks)[:max_bytes]
+
+    async def _fetch_page(self, url: str, client: Optional[httpx.AsyncClient] = None) -> Tuple[httpx.Headers, bytes]:
+        """
+        Response headers and body prefix of an audited page. get_tech_stack and
+        check_security_headers run together, so one GET serves both: results are
+        kept for PAGE_CACHE_TTL_SECONDS and concurrent callers share one fetch.
+        """
+        if url in self._page_cache:
+            return self._page_cache[url]
+
+        # Join the fetch already in flight for this URL, or start one. The task
+        # drops itself from _page_fetches when it finishes, success or not, and
+        # is shielded so a cancelled caller does not cancel it for the others.
+        task = self._page_fetches.get(url)
+        if task is None:
+            task = asyncio.ensure_future(self._load_page(url, client))
+            self._page_fetches[url] = task
+            task.add_done_callback(lambda done: self._page_fetch_done(url, done))
+        return await asyncio.shield(task)
+
+    async def _load_page(self, url: str, client: Optional[httpx.AsyncClient]) -> Tuple[httpx.Headers, bytes]:
+        response, body = await self._get_prefix(
+            url, client=client, max_bytes=TECH_SCAN_BYTES, timeout=15, headers=PAGE_HEADERS, follow_redirects=True
+        )
+        self._page_cache[url] = (response.headers, body)
+        return self._page_cache[url]
+
+    def _page_fetch_done(self, url: str, task: asyncio.Task):
+        if self._page_fetches.get(url) is task:
+            del self._page_fetches[url]
+        # Mark the error as retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    @cached(ttl=24 * 3600)
+    async def get_pagespeed_metrics(self, url: str, strategy: str = "mobile", client: Optional[httpx.AsyncClient] = None) -> Dict[str, Any]:
         """Fetch PageSpeed Insights metrics (Core Web Vitals)"""
-        if not settings.PAGESPEED_API_KEY:
+        if not self._pagespeed_key:
             logger.warning("PAGESPEED_API_KEY not configured, skipping PageSpeed audit.")
             return {}
 
         api_url = "https://www.googleapis.com/pagespeedonline/v5/runPagespeed"
         params = {
             "url": url,
-            "key": settings.PAGESPEED_API_KEY,
+            "key": self._pagespeed_key,
             "strategy": strategy,
-            "category": ["performance", "accessibility", "best-practices", "seo"]
+            "category": ["performance", "accessibility", "best-practices", "seo"],
+            # Partial response: Google trims the multi-MB Lighthouse report server-side
+            "fields": PAGESPEED_FIELDS
         }
 
         try:
-            async with httpx.AsyncClient(timeout=60) as client:
-                response = await client.get(api_url, params=params)
-                if response.status_code == 200:
-                    data = response.json()
-                    categories = data.get("lighthouseResult", {}).get("categories", {})
-                    return {
-                        "performance": categories.get("performance", {}).get("score", 0) * 100,
-                        "accessibility": categories.get("accessibility", {}).get("score", 0) * 100,
-                        "best_practices": categories.get("best-practices", {}).get("score", 0) * 100,
-                        "seo": categories.get("seo", {}).get("score", 0) * 100,
-                        "vitals": data.get("loadingExperience", {}).get("metrics", {})
-                    }
-                logger.error(f"PageSpeed API error: {response.status_code} - {response.text}")
-                return {}
+            response = await self._get(api_url, client=client, upstream="pagespeed", timeout=60, params=params)
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
+                categories = data.get("lighthouseResult", {}).get("categories", {})
+                return {
+                    "performance": categories.get("performance", {}).get("score", 0) * 100,
+                    "accessibility": categories.get("accessibility", {}).get("score", 0) * 100,
+                    "best_practices": categories.get("best-practices", {}).get("score", 0) * 100,
+                    "seo": categories.get("seo", {}).get("score", 0) * 100,
+                    "vitals": data.get("loadingExperience", {}).get("metrics", {})
+                }
+            logger.error("PageSpeed API error: %s", response.status_code)
+            return {}
         except Exception as e:
-            logger.error(f"Failed to fetch PageSpeed metrics: {e}")
+            logger.error("Failed to fetch PageSpeed metrics: %s", e)
             return {}
 
-    async def get_wayback_history(self, url: str) -> Dict[str, Any]:
-        """Fetch domain age and first-seen date from Wayback Machine"""
+    @cached(ttl=7 * 86400)
+    async def get_wayback_history(self, url: str, client: Optional[httpx.AsyncClient] = None) -> Dict[str, Any]:
+        """Fetch domain age and first-seen date from the Wayback Machine CDX API"""
         try:
-            import waybackpy
-            user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            wayback = waybackpy.Url(url, user_agent)
-            oldest = wayback.oldest()
-            if oldest:
+            # CDX results are oldest-first, so the first row after the header is the earliest capture
+            params = {"url": url, "output": "json", "limit": 1, "fl": "timestamp,original"}
+            response = await self._get("https://web.archive.org/cdx/search/cdx", client=client, upstream="wayback", timeout=20, params=params)
+            response.raise_for_status()
+            rows = orjson.loads(response.content) if response.content.strip() else []
+            if len(rows) > 1:
+                timestamp, original = rows[1][0], rows[1][1]
                 return {
-                    "first_seen": oldest.timestamp.isoformat(),
-                    "wayback_url": oldest.archive_url,
+                    "first_seen": datetime.strptime(timestamp, "%Y%m%d%H%M%S").isoformat(),
+                    "wayback_url": f"https://web.archive.org/web/{timestamp}/{original}",
                     "versions_found": True
                 }
             return {"versions_found": False}
         except Exception as e:
-            logger.warning(f"Wayback Machine check failed: {e}")
+            logger.warning("Wayback Machine check failed: %s", e)
             return {"error": str(e)}
 
-    async def get_tech_stack(self, url: str) -> Dict[str, Any]:
+    @cached(ttl=24 * 3600)
+    async def get_tech_stack(self, url: str, client: Optional[httpx.AsyncClient] = None) -> Dict[str, Any]:
         """Analyze tech stack using pattern matching on HTML and headers"""
         try:
-            headers_to_send = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            }
-            async with httpx.AsyncClient(timeout=15, follow_redirects=True) as client:
-                response = await client.get(url, headers=headers_to_send)
-                resp_headers = response.headers
-                html = response.text.lower()
-                
-                tech = {
-                    "cms": [],
-                    "analytics": [],
-                    "frameworks": [],
-                    "cdn": []
-                }
-                
-                # CMS Detection
-                if "wp-content" in html or "wp-includes" in html or "wordpress" in html:
-                    tech["cms"].append("WordPress")
-                if "shopify" in html or "cdn.shopify" in html:
-                    tech["cms"].append("Shopify")
-                if "wix" in html or "wixsite" in html:
-                    tech["cms"].append("Wix")
-                if "squarespace" in html:
-                    tech["cms"].append("Squarespace")
-                if "drupal" in html or "sites/all" in html:
-                    tech["cms"].append("Drupal")
-                if "joomla" in html:
-                    tech["cms"].append("Joomla")
-                if "webflow" in html:
-                    tech["cms"].append("Webflow")
-                
-                # Analytics Detection
-                if "google-analytics" in html or "gtag(" in html or "ga(" in html or "googletagmanager" in html:
-                    tech["analytics"].append("Google Analytics")
-                if "fbevents.js" in html or "facebook.net/en_us/fbevents" in html:
-                    tech["analytics"].append("Meta Pixel")
-                if "hotjar" in html:
-                    tech["analytics"].append("Hotjar")
-                if "segment" in html and "analytics.js" in html:
-                    tech["analytics"].append("Segment")
-                if "mixpanel" in html:
-                    tech["analytics"].append("Mixpanel")
-                if "amplitude" in html:
-                    tech["analytics"].append("Amplitude")
-                
-                # Framework Detection
-                if "_next/" in html or "__next" in html or "next.js" in html:
-                    tech["frameworks"].append("Next.js")
-                if "react" in html or "reactdom" in html or "__react" in html:
-                    tech["frameworks"].append("React")
-                if "vue" in html or "__vue__" in html:
-                    tech["frameworks"].append("Vue.js")
-                if "angular" in html or "ng-version" in html:
-                    tech["frameworks"].append("Angular")
-                if "svelte" in html:
-                    tech["frameworks"].append("Svelte")
-                if "gatsby" in html:
-                    tech["frameworks"].append("Gatsby")
-                if "nuxt" in html:
-                    tech["frameworks"].append("Nuxt.js")
-                if "tailwind" in html:
-                    tech["frameworks"].append("Tailwind CSS")
-                if "bootstrap" in html:
-                    tech["frameworks"].append("Bootstrap")
-                
-                # CDN Detection
-                server = resp_headers.get("server", "").lower()
-                via = resp_headers.get("via", "").lower()
-                
-                if "cloudflare" in server or "cloudflare" in resp_headers.get("cf-ray", ""):
-                    tech["cdn"].append("Cloudflare")
-                if "akamai" in server or "akamai" in via:
-                    tech["cdn"].append("Akamai")
-                if "fastly" in server or "fastly" in via:
-                    tech["cdn"].append("Fastly")
-                if "amazonaws" in html or "cloudfront" in resp_headers.get("x-amz-cf-id", ""):
-                    tech["cdn"].append("AWS CloudFront")
-                if "vercel" in server or "vercel" in html:
-                    tech["cdn"].append("Vercel")
-                if "netlify" in server:
-                    tech["cdn"].append("Netlify")
-                if "azureedge" in html:
-                    tech["cdn"].append("Azure CDN")
-                
-                logger.info(f"Tech stack for {url}: {tech}")
-                return tech
+            resp_headers, body = await self._fetch_page(url, client=client)
+            if len(body) > TECH_SCAN_THREAD_THRESHOLD:
+                tech = await asyncio.to_thread(_scan_tech, body, resp_headers)
+            else:
+                tech = _scan_tech(body, resp_headers)
+            
+            logger.info("Tech stack for %s: %s", url, tech)
+            return tech
         except Exception as e:
-            logger.error(f"Tech stack detection failed: {e}")
+            logger.error("Tech stack detection failed: %s", e)
             return {}
 
-    async def check_security_headers(self, url: str) -> Dict[str, Any]:
+    @cached(ttl=3600)
+    async def check_security_headers(self, url: str, client: Optional[httpx.AsyncClient] = None) -> Dict[str, Any]:
         """
         Audit security headers with CDN/WAF-aware scoring.
         Accounts for enterprise sites that handle security at edge/WAF level.
         """
         try:
-            headers_to_send = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
+            # Shares the GET made for get_tech_stack; only the headers are read here
+            resp_headers, _ = await self._fetch_page(url, client=client)
+            
+            csp = resp_headers.get("content-security-policy", "").lower()
+            hsts = resp_headers.get("strict-transport-security", "").lower()
+            xfo = resp_headers.get("x-frame-options", "").lower()
+            xcto = resp_headers.get("x-content-type-options", "").lower()
+            pp = resp_headers.get("permissions-policy", "").lower()
+            server = resp_headers.get("server", "").lower()
+            
+            # 1. Detect CDN/Edge/Enterprise Security Indicators
+            # The Server header is tokenised once; every provider check below reuses it
+            server_vendors = set(_cdn_vendors(server))
+            edge_provider = next((vendor.capitalize() for vendor in EDGE_PROVIDERS if vendor in server_vendors), None)
+            edge_managed = edge_provider is not None
+            waf_protected = False
+            
+            # Check Cloudflare by cf-ray header
+            if "cf-ray" in resp_headers:
+                edge_managed = True
+                edge_provider = "Cloudflare"
+                waf_protected = True
+            
+            # Check Amazon CloudFront
+            if "x-amz-cf-id" in resp_headers or "x-amz-cf-pop" in resp_headers:
+                edge_managed = True
+                edge_provider = "Amazon CloudFront"
+                waf_protected = True
+            
+            # Check Akamai
+            if "x-akamai-transformed" in resp_headers or "akamai" in server_vendors:
+                edge_managed = True
+                edge_provider = "Akamai"
+                waf_protected = True
+            
+            # 2. Enhanced Detection Logic with WAF Awareness
+            def get_check_status(header_present: bool, header_name: str, csp_fallback: str = None):
+                """Determine status with WAF consideration"""
+                if header_present:
+                    return True, "Present"
+                elif csp_fallback and csp_fallback in csp:
+                    return True, "Mitigated via CSP"
+                elif waf_protected:
+                    return True, "WAF-Protected (likely enforced at edge)"
+                elif edge_managed:
+                    return True, "Edge-Managed (may be enforced at CDN)"
+                else:
+                    return False, "Missing"
+            
+            # (present, status) per header
+            checks = {}
+            
+            # HSTS
+            checks["Strict-Transport-Security"] = get_check_status(hsts != "", "HSTS")
+            
+            # CSP - Critical header, less likely to be WAF-managed
+            csp_present = csp != ""
+            checks["Content-Security-Policy"] = (
+                csp_present or waf_protected,
+                "Present" if csp_present else ("WAF-Managed" if waf_protected else "Missing")
+            )
+            
+            # X-Frame-Options (can be in CSP)
+            checks["X-Frame-Options"] = get_check_status(xfo != "", "XFO", "frame-ancestors")
+            
+            # X-Content-Type-Options
+            checks["X-Content-Type-Options"] = get_check_status(xcto != "", "XCTO")
+            
+            # Permissions-Policy (newer, less common)
+            pp_present = pp != ""
+            checks["Permissions-Policy"] = (
+                pp_present or edge_managed,  # Give credit if edge-managed
+                "Present" if pp_present else ("Optional (Edge-Managed)" if edge_managed else "Missing")
+            )
+            
+            # 3. Calculate Score
+            passed_weight = sum(weight for name, weight in SECURITY_HEADER_SPEC if checks[name][0])
+            score = (passed_weight / SECURITY_TOTAL_WEIGHT) * 100
+            
+            # 4. Enterprise bonus - sites behind enterprise WAF/CDN get higher baseline
+            if waf_protected and score < 70:
+                score = max(score, 70)  # Enterprise sites get minimum 70%
+            elif edge_managed and score < 50:
+                score = max(score, 50)  # CDN sites get minimum 50%
+            
+            logger.info("Security headers for %s: %s%% (Edge: %s, WAF: %s)", url, score, edge_provider, waf_protected)
+            
+            return {
+                "checks": {name: checks[name][0] for name, _ in SECURITY_HEADER_SPEC},
+                "details": {name: checks[name][1] for name, _ in SECURITY_HEADER_SPEC},
+                "security_score": round(score, 1),
+                "edge_managed": edge_managed,
+                "edge_provider": edge_provider,
+                "waf_protected": waf_protected,
+                "note": "Enterprise sites protected by CDN/WAF may show headers as edge-managed"
             }
-            async with httpx.AsyncClient(timeout=15, follow_redirects=True) as client:
-                response = await client.get(url, headers=headers_to_send)
-                resp_headers = response.headers
-                
-                csp = resp_headers.get("content-security-policy", "").lower()
-                hsts = resp_headers.get("strict-transport-security", "").lower()
-                xfo = resp_headers.get("x-frame-options", "").lower()
-                xcto = resp_headers.get("x-content-type-options", "").lower()
-                pp = resp_headers.get("permissions-policy", "").lower()
-                server = resp_headers.get("server", "").lower()
-                
-                # 1. Detect CDN/Edge/Enterprise Security Indicators
-                edge_managed = False
-                edge_provider = None
-                waf_protected = False
-                
-                # Check for CDN providers
-                cdn_indicators = ["akamai", "cloudflare", "fastly", "vercel", "netlify", "cloudfront", "incapsula"]
-                for cdn in cdn_indicators:
-                    if cdn in server:
-                        edge_managed = True
-                        edge_provider = cdn.capitalize()
-                        break
-                
-                # Check Cloudflare by cf-ray header
-                if "cf-ray" in resp_headers:
-                    edge_managed = True
-                    edge_provider = "Cloudflare"
-                    waf_protected = True
-                
-                # Check Amazon CloudFront
-                if "x-amz-cf-id" in resp_headers or "x-amz-cf-pop" in resp_headers:
-                    edge_managed = True
-                    edge_provider = "Amazon CloudFront"
-                    waf_protected = True
-                
-                # Check Akamai
-                if "x-akamai-transformed" in resp_headers or "akamai" in server:
-                    edge_managed = True
-                    edge_provider = "Akamai"
-                    waf_protected = True
-                
-                # Check for any x-powered-by enterprise frameworks
-                x_powered = resp_headers.get("x-powered-by", "").lower()
-                if any(x in x_powered for x in ["express", "aspnet", "php"]):
-                    # Standard apps - no special treatment
-                    pass
-                
-                # 2. Enhanced Detection Logic with WAF Awareness
-                def get_check_status(header_present: bool, header_name: str, csp_fallback: str = None):
-                    """Determine status with WAF consideration"""
-                    if header_present:
-                        return True, "Present"
-                    elif csp_fallback and csp_fallback in csp:
-                        return True, "Mitigated via CSP"
-                    elif waf_protected:
-                        return True, "WAF-Protected (likely enforced at edge)"
-                    elif edge_managed:
-                        return True, "Edge-Managed (may be enforced at CDN)"
-                    else:
-                        return False, "Missing"
-                
-                checks = {}
-                
-                # HSTS
-                hsts_present, hsts_status = get_check_status(hsts != "", "HSTS")
-                checks["Strict-Transport-Security"] = {
-                    "present": hsts_present,
-                    "status": hsts_status,
-                    "weight": 30
-                }
-                
-                # CSP - Critical header, less likely to be WAF-managed
-                csp_present = csp != ""
-                checks["Content-Security-Policy"] = {
-                    "present": csp_present or waf_protected,
-                    "status": "Present" if csp_present else ("WAF-Managed" if waf_protected else "Missing"),
-                    "weight": 35
-                }
-                
-                # X-Frame-Options (can be in CSP)
-                xfo_present, xfo_status = get_check_status(xfo != "", "XFO", "frame-ancestors")
-                checks["X-Frame-Options"] = {
-                    "present": xfo_present,
-                    "status": xfo_status,
-                    "weight": 15
-                }
-                
-                # X-Content-Type-Options
-                xcto_present, xcto_status = get_check_status(xcto != "", "XCTO")
-                checks["X-Content-Type-Options"] = {
-                    "present": xcto_present,
-                    "status": xcto_status,
-                    "weight": 10
-                }
-                
-                # Permissions-Policy (newer, less common)
-                pp_present = pp != ""
-                checks["Permissions-Policy"] = {
-                    "present": pp_present or edge_managed,  # Give credit if edge-managed
-                    "status": "Present" if pp_present else ("Optional (Edge-Managed)" if edge_managed else "Missing"),
-                    "weight": 10
-                }
-                
-                # 3. Calculate Score
-                total_weight = sum(c["weight"] for c in checks.values())
-                passed_weight = sum(c["weight"] for c in checks.values() if c["present"])
-                score = (passed_weight / total_weight) * 100
-                
-                # 4. Enterprise bonus - sites behind enterprise WAF/CDN get higher baseline
-                if waf_protected and score < 70:
-                    score = max(score, 70)  # Enterprise sites get minimum 70%
-                elif edge_managed and score < 50:
-                    score = max(score, 50)  # CDN sites get minimum 50%
-                
-                logger.info(f"Security headers for {url}: {score}% (Edge: {edge_provider}, WAF: {waf_protected})")
-                
-                return {
-                    "checks": {k: v["present"] for k, v in checks.items()},
-                    "details": {k: v["status"] for k, v in checks.items()},
-                    "security_score": round(score, 1),
-                    "edge_managed": edge_managed,
-                    "edge_provider": edge_provider,
-                    "waf_protected": waf_protected,
-                    "note": "Enterprise sites protected by CDN/WAF may show headers as edge-managed"
-                }
         except Exception as e:
-            logger.error(f"Security headers check failed: {e}")
+            logger.error("Security headers check failed: %s", e)
             return {"security_score": 0, "error": str(e)}
 
+    @cached(ttl=3600)
     async def get_ddg_research(self, query: str) -> Dict[str, Any]:
         """Search DuckDuckGo with robust fallback for missing results"""
         try:
-            from duckduckgo_search import DDGS
-            with DDGS() as ddgs:
-                # 1. FORCE US-English search for high-fidelity SaaS/Marketing metrics
-                results = list(ddgs.text(query, region='us-en', max_results=15))
-                
-                # 2. BLACKLIST irrelevant regional domains for English queries
-                # These often appear due to localized routing and pollute SEO metrics.
-                blacklist = ["baidu.com", "zhihu.com", "qq.com", "163.com", "sohu.com", "sina.com.cn"]
-                
-                formatted_results = []
-                for r in results:
-                    url = (r.get("href") or r.get("link", "")).lower()
-                    
-                    # Skip blacklisted domains
-                    if any(domain in url for domain in blacklist):
-                        continue
-                        
-                    formatted_results.append({
-                        "title": r.get("title", "Untitled"),
-                        "url": r.get("href", r.get("link", "#")),
-                        "description": r.get("body", r.get("snippet", ""))
-                    })
-                
-                # 3. RETRY with explicit language hints if we got filtered down too much
-                if len(formatted_results) < 3:
-                    logger.warning(f"Insufficient English results for '{query}', retrying with hints...")
-                    refined_query = f"{query} in english"
-                    retry_results = list(ddgs.text(refined_query, region='us-en', max_results=10))
-                    
-                    for r in retry_results:
-                        url = (r.get("href") or r.get("link", "")).lower()
-                        if not any(domain in url for domain in blacklist):
-                            formatted_results.append({
-                                "title": r.get("title", "Untitled"),
-                                "url": r.get("href", r.get("link", "#")),
-                                "description": r.get("body", r.get("snippet", ""))
-                            })
-                    
-                return {"results": formatted_results[:10]}
+            # DDGS is a blocking client; run the whole search off the event loop
+            return {"results": await asyncio.to_thread(_ddg_search, query)}
         except Exception as e:
-            logger.error(f"DuckDuckGo search failed for '{query}': {e}")
+            logger.error("DuckDuckGo search failed for '%s': %s", query, e)
             return {"results": []}
     
     # ============= NEW API INTEGRATIONS =============
     
-    async def get_domain_authority(self, domain: str) -> Dict[str, Any]:
+    async def get_domain_authority(self, domain: str, client: Optional[httpx.AsyncClient] = None, force_refresh: bool = False) -> Dict[str, Any]:
         """
         Get Domain Authority from OpenPageRank (FREE API).
         Returns scores similar to Moz DA.
@@ -356,61 +651,69 @@ class ExternalAPIService:
         """
         try:
             # Clean domain
-            domain = domain.replace("https://", "").replace("http://", "").replace("www.", "").split("/")[0]
+            domain = _norm_domain(domain)
+            if not force_refresh and domain in self._authority_cache:
+                return self._authority_cache[domain]
             
-            api_url = f"https://openpagerank.com/api/v1.0/getPageRank"
-            headers = {"API-OPR": settings.OPENPAGERANK_API_KEY} if hasattr(settings, 'OPENPAGERANK_API_KEY') and settings.OPENPAGERANK_API_KEY else {}
+            response = await self._get(OPR_API_URL, client=client, upstream="opr", timeout=15, params={"domains[]": domain}, headers=self._opr_headers)
+            
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
+                if data.get("status_code") == 200 and data.get("response"):
+                    result = _parse_opr_row(data["response"][0])
+                    logger.info("OpenPageRank for %s: DA=%s, PR=%s, Rank=%s", domain, result['domain_authority'], result['page_rank'], result['global_rank'])
+                    self._authority_cache[domain] = result
+                    return result
+                
+            logger.warning("OpenPageRank returned no data for %s", domain)
+            return {"domain_authority": 0, "data_source": "no_data"}
             
-            async with httpx.AsyncClient(timeout=15) as client:
-                response = await client.get(api_url, params={"domains[]": domain}, headers=headers)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get("status_code") == 200 and data.get("response"):
-                        result = data["response"][0]
-                        
-                        # Handle potential string/None values from API
-                        page_rank_raw = result.get("page_rank_decimal")
-                        rank_raw = result.get("rank")
-                        
-                        try:
-                            page_rank = float(page_rank_raw) if page_rank_raw else 0
-                        except (ValueError, TypeError):
-                            page_rank = 0
-                        
-                        try:
-                            rank = int(rank_raw) if rank_raw else 0
-                        except (ValueError, TypeError):
-                            rank = 0
-                        
-                        # Convert PageRank (0-10) to Authority (0-100)
-                        # Formula: DA = PageRank * 10 + bonus for low rank
-                        authority = min(100, int(page_rank * 10) + (10 if rank > 0 and rank < 1000000 else 0))
-                        
-                        logger.info(f"OpenPageRank for {domain}: DA={authority}, PR={page_rank}, Rank={rank}")
-                        return {
-                            "domain_authority": authority,
-                            "page_rank": page_rank,
-                            "global_rank": rank,
-                            "data_source": "openpagerank",
-                            "confidence": "high"
-                        }
-                    
-                logger.warning(f"OpenPageRank returned no data for {domain}")
-                return {"domain_authority": 0, "data_source": "no_data"}
-                
         except Exception as e:
-            logger.error(f"OpenPageRank API failed: {e}")
+            logger.error("OpenPageRank API failed: %s", e)
             return {"domain_authority": 0, "data_source": "error", "error": str(e)}
     
-    async def get_backlink_count(self, domain: str, authority_score: int = 0) -> Dict[str, Any]:
+    async def get_domain_authorities_bulk(self, domains: List[str], client: Optional[httpx.AsyncClient] = None, force_refresh: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        Domain Authority for many domains, OPR_BATCH_SIZE per OpenPageRank request.
+        Returns {normalised domain: result} in the same shape as get_domain_authority.
+        """
+        domains = list(dict.fromkeys(_norm_domain(domain) for domain in domains))
+        out = {} if force_refresh else {domain: self._authority_cache[domain] for domain in domains if domain in self._authority_cache}
+        missing = [domain for domain in domains if domain not in out]
+        
+        for start in range(0, len(missing), OPR_BATCH_SIZE):
+            batch = missing[start:start + OPR_BATCH_SIZE]
+            try:
+                response = await self._get(
+                    OPR_API_URL, client=client, upstream="opr", timeout=15,
+                    params=[("domains[]", domain) for domain in batch], headers=self._opr_headers
+                )
+                data = orjson.loads(response.content) if response.status_code == 200 else {}
+                for row in data.get("response") or []:
+                    domain = row.get("domain")
+                    if domain in batch and row.get("status_code") == 200:
+                        out[domain] = self._authority_cache[domain] = _parse_opr_row(row)
+            except Exception as e:
+                logger.error("OpenPageRank bulk lookup failed: %s", e)
+                for domain in batch:
+                    out.setdefault(domain, {"domain_authority": 0, "data_source": "error", "error": str(e)})
+        
+        for domain in missing:
+            out.setdefault(domain, {"domain_authority": 0, "data_source": "no_data"})
+        return out
+    
+    async def get_backlink_count(self, domain: str, authority_score: int = 0, client: Optional[httpx.AsyncClient] = None, force_refresh: bool = False) -> Dict[str, Any]:
         """
         Get backlink count from CommonCrawl Index (FREE).
         Uses dynamic scaling based on authority to estimate total index size.
         """
         try:
             # Clean domain
-            domain = domain.replace("https://", "").replace("http://", "").replace("www.", "").split("/")[0]
+            domain = _norm_domain(domain)
+            # Near-equal authority scores scale the sample almost identically, so share an entry
+            cache_key = (domain, round(authority_score / 5))
+            if not force_refresh and cache_key in self._backlink_cache:
+                return self._backlink_cache[cache_key]
             
             # Use the latest CommonCrawl index
             index_url = "https://index.commoncrawl.org/CC-MAIN-2024-51-index"
@@ -422,47 +725,51 @@ class ExternalAPIService:
                 "limit": 500  # Increased limit for better sampling
             }
             
-            async with httpx.AsyncClient(timeout=30) as client:
-                response = await client.get(index_url, params=params)
-                
-                if response.status_code == 200:
-                    lines = response.text.strip().split("\n")
-                    backlinks_found = len([l for l in lines if l.strip()])
-                    
-                    # UNIVERSAL SCALING MODEL:
-                    # Higher authority sites have deeper link graphs that require 
-                    # exponential scaling of the sampled data.
-                    # Multiplier starts at 50 and scales to ~10,000 for DA 100.
-                    
-                    eff_authority = authority_score if authority_score > 0 else 20 # Assume baseline
-                    
-                    # Formula: Base (50) + Exponential Authority Growth
-                    multiplier = 50 + int((eff_authority ** 2) / 1.1)
-                    
-                    # Capping for extreme outliers
-                    multiplier = min(multiplier, 15000)
-                    
-                    estimated_total = backlinks_found * multiplier
-                    # Referring domains typically 5-15% of total backlink count
-                    referring_domains = int(estimated_total * 0.12)
-                    
-                    logger.info(f"Backlinks for {domain}: sampled {backlinks_found} (DA {eff_authority}) -> est {estimated_total} backlinks")
-                    return {
-                        "total_backlinks": estimated_total,
-                        "referring_domains": referring_domains,
-                        "sample_size": backlinks_found,
-                        "data_source": "commoncrawl",
-                        "confidence": "high" if eff_authority > 50 else "medium"
-                    }
-                
-                logger.warning(f"CommonCrawl returned status {response.status_code}")
-                return {"total_backlinks": 0, "data_source": "no_data"}
-                
+            response = await self._get(index_url, client=client, upstream="commoncrawl", timeout=30, params=params)
+            
+            if response.status_code == 200:
+                # One JSON record per line: count newlines in the raw body instead of
+                # decoding it and materialising a list of line strings
+                body = response.content.strip()
+                backlinks_found = body.count(b"\n") + 1 if body else 0
+                
+                # UNIVERSAL SCALING MODEL:
+                # Higher authority sites have deeper link graphs that require 
+                # exponential scaling of the sampled data.
+                # Multiplier starts at 50 and scales to ~10,000 for DA 100.
+                
+                eff_authority = authority_score if authority_score > 0 else 20 # Assume baseline
+                
+                # Formula: Base (50) + Exponential Authority Growth
+                multiplier = 50 + int((eff_authority ** 2) / 1.1)
+                
+                # Capping for extreme outliers
+                multiplier = min(multiplier, 15000)
+                
+                estimated_total = backlinks_found * multiplier
+                # Referring domains typically 5-15% of total backlink count
+                referring_domains = int(estimated_total * 0.12)
+                
+                logger.info("Backlinks for %s: sampled %s (DA %s) -> est %s backlinks", domain, backlinks_found, eff_authority, estimated_total)
+                result = {
+                    "total_backlinks": estimated_total,
+                    "referring_domains": referring_domains,
+                    "sample_size": backlinks_found,
+                    "data_source": "commoncrawl",
+                    "confidence": "high" if eff_authority > 50 else "medium"
+                }
+                self._backlink_cache[cache_key] = result
+                return result
+            
+            logger.warning("CommonCrawl returned status %s", response.status_code)
+            return {"total_backlinks": 0, "data_source": "no_data"}
+            
         except Exception as e:
-            logger.error(f"CommonCrawl API failed: {e}")
+            logger.error("CommonCrawl API failed: %s", e)
             return {"total_backlinks": 0, "data_source": "error", "error": str(e)}
     
-    async def get_ssl_grade(self, domain: str) -> Dict[str, Any]:
+    @cached(ttl=24 * 3600)
+    async def get_ssl_grade(self, domain: str, client: Optional[httpx.AsyncClient] = None) -> Dict[str, Any]:
         """
         Get SSL grade from SSL Labs (FREE API).
         Returns professional A+ to F grading.
@@ -472,7 +779,7 @@ class ExternalAPIService:
         """
         try:
             # Clean domain
-            domain = domain.replace("https://", "").replace("http://", "").replace("www.", "").split("/")[0]
+            domain = _norm_domain(domain)
             
             api_url = "https://api.ssllabs.com/api/v3/analyze"
             params = {
@@ -481,45 +788,53 @@ class ExternalAPIService:
                 "maxAge": 24  # Accept cache up to 24 hours old
             }
             
-            async with httpx.AsyncClient(timeout=30) as client:
-                response = await client.get(api_url, params=params)
+            response = await self._get(api_url, client=client, upstream="ssllabs", timeout=30, params=params)
+            
+            # A fresh assessment takes 60-90s; poll with backoff so the caller's other
+            # gathered audits keep running while SSL Labs finishes
+            delay, waited = SSL_POLL_INITIAL_DELAY, 0.0
+            while response.status_code == 200:
+                data = orjson.loads(response.content)
+                status = data.get("status", "")
+                
+                if status == "READY":
+                    endpoints = data.get("endpoints", [])
+                    if endpoints:
+                        grade = endpoints[0].get("grade", "?")
+                        has_warnings = endpoints[0].get("hasWarnings", False)
+                        
+                        score = SSL_GRADE_SCORES.get(grade, 50)
+                        
+                        logger.info("SSL Labs for %s: Grade=%s", domain, grade)
+                        return {
+                            "ssl_grade": grade,
+                            "ssl_score": score,
+                            "has_warnings": has_warnings,
+                            "data_source": "ssllabs",
+                            "confidence": "high"
+                        }
+                    break
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    status = data.get("status", "")
-                    
-                    if status == "READY":
-                        endpoints = data.get("endpoints", [])
-                        if endpoints:
-                            grade = endpoints[0].get("grade", "?")
-                            has_warnings = endpoints[0].get("hasWarnings", False)
-                            
-                            # Convert grade to score
-                            grade_scores = {"A+": 100, "A": 95, "A-": 90, "B": 80, "C": 60, "D": 40, "E": 20, "F": 0}
-                            score = grade_scores.get(grade, 50)
-                            
-                            logger.info(f"SSL Labs for {domain}: Grade={grade}")
-                            return {
-                                "ssl_grade": grade,
-                                "ssl_score": score,
-                                "has_warnings": has_warnings,
-                                "data_source": "ssllabs",
-                                "confidence": "high"
-                            }
-                    
-                    elif status == "IN_PROGRESS":
+                if status not in ("IN_PROGRESS", "DNS"):
+                    break
+                if waited + delay > SSL_POLL_BUDGET_SECONDS:
+                    if status == "IN_PROGRESS":
                         return {"ssl_grade": "Scanning...", "data_source": "in_progress"}
-                    
-                    elif status == "DNS":
-                        return {"ssl_grade": "Resolving...", "data_source": "in_progress"}
+                    return {"ssl_grade": "Resolving...", "data_source": "in_progress"}
                 
-                return {"ssl_grade": "?", "data_source": "unavailable"}
+                await asyncio.sleep(delay)
+                waited += delay
+                delay = min(delay * 2, SSL_POLL_MAX_DELAY)
+                response = await self._get(api_url, client=client, upstream="ssllabs", timeout=30, params=params)
+            
+            return {"ssl_grade": "?", "data_source": "unavailable"}
                 
         except Exception as e:
-            logger.error(f"SSL Labs API failed: {e}")
+            logger.error("SSL Labs API failed: %s", e)
             return {"ssl_grade": "?", "data_source": "error"}
     
-    async def validate_html(self, url: str) -> Dict[str, Any]:
+    @cached(ttl=3600)
+    async def validate_html(self, url: str, client: Optional[httpx.AsyncClient] = None) -> Dict[str, Any]:
         """
         Validate HTML using W3C Validator (FREE API).
         Returns error and warning counts.
@@ -537,34 +852,71 @@ class ExternalAPIService:
                 "User-Agent": "SEO-Agent/1.0 (HTML Validation)"
             }
             
-            async with httpx.AsyncClient(timeout=30) as client:
-                response = await client.get(api_url, params=params, headers=headers)
+            response = await self._get(api_url, client=client, upstream="w3c", timeout=30, params=params, headers=headers)
+            
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
+                messages = data.get("messages", [])
+                
+                errors = len([m for m in messages if m.get("type") == "error"])
+                warnings = len([m for m in messages if m.get("type") in ["warning", "info"]])
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    messages = data.get("messages", [])
-                    
-                    errors = len([m for m in messages if m.get("type") == "error"])
-                    warnings = len([m for m in messages if m.get("type") in ["warning", "info"]])
-                    
-                    # Get first 3 errors for display
-                    top_errors = [m.get("message", "")[:100] for m in messages if m.get("type") == "error"][:3]
-                    
-                    logger.info(f"W3C Validator for {url}: {errors} errors, {warnings} warnings")
-                    return {
-                        "html_errors": errors,
-                        "html_warnings": warnings,
-                        "top_errors": top_errors,
-                        "data_source": "w3c_validator",
-                        "confidence": "high"
-                    }
+                # Get first 3 errors for display
+                top_errors = [m.get("message", "")[:100] for m in messages if m.get("type") == "error"][:3]
                 
-                return {"html_errors": 0, "data_source": "unavailable"}
+                logger.info("W3C Validator for %s: %s errors, %s warnings", url, errors, warnings)
+                return {
+                    "html_errors": errors,
+                    "html_warnings": warnings,
+                    "top_errors": top_errors,
+                    "data_source": "w3c_validator",
+                    "confidence": "high"
+                }
+            
+            return {"html_errors": 0, "data_source": "unavailable"}
                 
         except Exception as e:
-            logger.error(f"W3C Validator failed: {e}")
+            logger.error("W3C Validator failed: %s", e)
             return {"html_errors": 0, "data_source": "error"}
 
+    async def audit_all(self, url: str, domain: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Run every external audit for a site concurrently.
+        Backlinks depend on the authority score, so those two are chained;
+        everything else starts at once. A failing audit yields {"error": ...}.
+        """
+        domain = _norm_domain(domain or url)
+
+        async def authority_then_backlinks():
+            authority = await self.get_domain_authority(domain)
+            backlinks = await self.get_backlink_count(domain, authority.get("domain_authority", 0))
+            return authority, backlinks
+
+        names = ("pagespeed", "wayback", "tech_stack", "security", "authority_backlinks", "ssl", "html_validation")
+        results = await asyncio.gather(
+            self.get_pagespeed_metrics(url),
+            self.get_wayback_history(url),
+            self.get_tech_stack(url),
+            self.check_security_headers(url),
+            authority_then_backlinks(),
+            self.get_ssl_grade(domain),
+            self.validate_html(url),
+            return_exceptions=True
+        )
+        audit = {}
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                logger.error("%s audit failed for %s: %s", name, url, result)
+                result = {"error": str(result)}
+            audit[name] = result
+
+        authority_backlinks = audit.pop("authority_backlinks")
+        if isinstance(authority_backlinks, tuple):
+            audit["authority"], audit["backlinks"] = authority_backlinks
+        else:
+            audit["authority"] = audit["backlinks"] = authority_backlinks
+        return audit
+
 
 external_apis = ExternalAPIService()
 
@@ -6,6 +6,7 @@ Provides the framework for real-time traffic and keyword data from Google.
 import logging
 from typing import Dict, Any, List, Optional
 from app.core.config import settings
+from app.services.api_cache import get_or_fetch
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +19,9 @@ from googleapiclient.discovery import build
 
 logger = logging.getLogger(__name__)
 
+# Search Console data is 30-day aggregates; an hour-old copy is fine
+GSC_CACHE_TTL_SECONDS = 3600
+
 # Scopes required for GSC and Analytics
 SCOPES = [
     'https://www.googleapis.com/auth/webmasters.readonly',
@@ -108,13 +112,18 @@ class GoogleMetricsService:
             return False
 
     async def get_gsc_data(self, domain: str) -> Dict[str, Any]:
-        """Fetch keyword impression and click data from Search Console"""
+        """Fetch keyword impression and click data from Search Console (cached for an hour)"""
         if not self.credentials:
             return {
                 "status": "not_authenticated",
                 "message": "Please log in with Google to see real GSC data."
             }
-        
+        return await get_or_fetch(
+            "gsc", [domain], GSC_CACHE_TTL_SECONDS, lambda: self._query_gsc(domain),
+            cacheable=lambda result: result.get("status") == "success"
+        )
+
+    async def _query_gsc(self, domain: str) -> Dict[str, Any]:
         try:
             # Refresh if expired
             if self.credentials.expired and self.credentials.refresh_token:
@@ -11,6 +11,9 @@ from app.agents.orchestrator import agent_orchestrator, AgentType
 
 logger = logging.getLogger(__name__)
 
+# Concurrent Search Console checks during the daily run
+MONITOR_CONCURRENCY = 10
+
 class GSCMonitorService:
     """
     Closed-Loop Execution Engine:
@@ -73,20 +76,39 @@ class GSCMonitorService:
         
         return task_id
 
+    async def _monitor_domain(self, domain: str, semaphore: asyncio.Semaphore) -> List[Dict[str, Any]]:
+        """Check one domain and trigger a correction per anomaly"""
+        async with semaphore:
+            health = await self.check_gsc_health(domain)
+        if health["status"] != "attention_required":
+            return []
+        task_ids = await asyncio.gather(*(
+            self.trigger_self_correction(anomaly, domain) for anomaly in health["anomalies"]
+        ))
+        return [{"domain": domain, "action": "correction_triggered", "task_id": task_id} for task_id in task_ids]
+
     async def run_daily_monitor(self):
         """Cron job entry point"""
         logger.info("Starting Daily GSC Monitor...")
         # Imagine this lists all clients from Supabase
         domains = ["example.com"] 
         
-        results = []
-        for domain in domains:
-            health = await self.check_gsc_health(domain)
-            if health["status"] == "attention_required":
-                for anomaly in health["anomalies"]:
-                    task_id = await self.trigger_self_correction(anomaly, domain)
-                    results.append({"domain": domain, "action": "correction_triggered", "task_id": task_id})
+        # Domains are checked concurrently, at most MONITOR_CONCURRENCY GSC queries at a time
+        semaphore = asyncio.Semaphore(MONITOR_CONCURRENCY)
+        outcomes = await asyncio.gather(
+            *(self._monitor_domain(domain, semaphore) for domain in domains),
+            return_exceptions=True
+        )
+        
+        # A failed domain is reported alongside the others instead of aborting the run
+        results, errors = [], []
+        for domain, outcome in zip(domains, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(f"GSC monitor failed for {domain}: {outcome}")
+                errors.append({"domain": domain, "action": "check_failed", "error": str(outcome)})
+            else:
+                results.extend(outcome)
         
-        return results
+        return results + errors
 
 gsc_monitor_service = GSCMonitorService()
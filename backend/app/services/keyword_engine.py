@@ -3,12 +3,13 @@ Keyword Research Engine - Keyword discovery, analysis, and SERP insights
 """
 
 from typing import Dict, Any, List
-from openai import AsyncOpenAI
 import logging
 import json
+import hashlib
 import httpx
 
 from app.core.config import settings
+from app.core.openai_client import get_openai_client
 from app.utils.helpers import extract_json
 
 logger = logging.getLogger(__name__)
@@ -24,7 +25,7 @@ class KeywordEngineService:
     def client(self):
         """Lazy initialization of OpenAI client"""
         if self._client is None and settings.OPENAI_API_KEY:
-            self._client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+            self._client = get_openai_client()
             logger.info("OpenAI client initialized for KeywordEngine")
         return self._client
     
@@ -157,8 +158,7 @@ Return JSON: {{"keywords": [{{"keyword": "<text>", "search_volume_estimate": "<h
             
         except Exception as e:
             logger.error(f"Error analyzing keyword: {e}")
-            import hashlib
-            name_hash = int(hashlib.md5(keyword.encode()).hexdigest()[:8], 16)
+            name_hash = int.from_bytes(hashlib.md5(keyword.encode()).digest()[:4], "big")
             return {
                 "keyword": keyword,
                 "difficulty_score": 15 + (name_hash % 30),
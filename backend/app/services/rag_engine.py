@@ -5,8 +5,8 @@ Handles semantic embeddings via OpenAI and vector search in Supabase
 
 import logging
 from typing import List, Dict, Any, Optional
-from openai import AsyncOpenAI
 from app.core.config import settings
+from app.core.openai_client import get_openai_client
 from app.core.database import get_supabase
 
 logger = logging.getLogger(__name__)
@@ -21,7 +21,7 @@ class RAGEngineService:
     def client(self):
         """Lazy initialization of OpenAI client"""
         if self._client is None and settings.OPENAI_API_KEY:
-            self._client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+            self._client = get_openai_client()
         return self._client
 
     async def get_embedding(self, text: str) -> List[float]:
@@ -0,0 +1,172 @@
+"""
+Schema Builders - deterministic JSON-LD for common schema.org types
+"""
+
+from typing import Any, Callable, Dict, Optional
+
+SCHEMA_CONTEXT = "https://schema.org"
+
+
+def _base(schema_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """@context/@type plus every non-empty property, assumed to use schema.org names"""
+    return {
+        "@context": SCHEMA_CONTEXT,
+        "@type": schema_type,
+        **{key: value for key, value in data.items() if value not in (None, "", [], {})}
+    }
+
+
+def _entity(value: Any, default_type: str) -> Any:
+    """Wrap a plain name in a typed entity; dicts and lists pass through"""
+    if isinstance(value, str):
+        return {"@type": default_type, "name": value}
+    return value
+
+
+def _pop_first(data: Dict[str, Any], *keys: str) -> Any:
+    """Remove and return the first present alias of a property"""
+    for key in keys:
+        if key in data:
+            return data.pop(key)
+    return None
+
+
+def _article(schema_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    headline = _pop_first(data, "headline", "title")
+    author = _pop_first(data, "author")
+    publisher = _pop_first(data, "publisher")
+    published = _pop_first(data, "datePublished", "date_published", "date")
+    schema = _base(schema_type, data)
+    if headline:
+        schema["headline"] = headline
+    if author:
+        schema["author"] = [_entity(a, "Person") for a in author] if isinstance(author, list) else _entity(author, "Person")
+    if publisher:
+        schema["publisher"] = _entity(publisher, "Organization")
+    if published:
+        schema["datePublished"] = published
+    return schema
+
+
+def _faq_page(schema_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    questions = _pop_first(data, "mainEntity", "questions", "faqs", "faq") or []
+    schema = _base(schema_type, data)
+    schema["mainEntity"] = [
+        q if "@type" in q else {
+            "@type": "Question",
+            "name": q.get("question") or q.get("name") or q.get("q"),
+            "acceptedAnswer": {"@type": "Answer", "text": q.get("answer") or q.get("text") or q.get("a")}
+        }
+        for q in questions
+    ]
+    return schema
+
+
+def _how_to(schema_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    steps = _pop_first(data, "step", "steps") or []
+    schema = _base(schema_type, data)
+    schema["step"] = [
+        {"@type": "HowToStep", "position": i, "text": step} if isinstance(step, str)
+        else {"@type": "HowToStep", "position": i, **step}
+        for i, step in enumerate(steps, 1)
+    ]
+    return schema
+
+
+def _breadcrumb_list(schema_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    items = _pop_first(data, "itemListElement", "items", "breadcrumbs") or []
+    schema = _base(schema_type, data)
+    schema["itemListElement"] = [
+        {"@type": "ListItem", "position": i, "name": item} if isinstance(item, str)
+        else {"@type": "ListItem", "position": i, "name": item.get("name"), "item": item.get("item") or item.get("url")}
+        for i, item in enumerate(items, 1)
+    ]
+    return schema
+
+
+def _product(schema_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    price = _pop_first(data, "price")
+    currency = _pop_first(data, "priceCurrency", "currency") or "USD"
+    availability = _pop_first(data, "availability")
+    brand = _pop_first(data, "brand")
+    rating = _pop_first(data, "ratingValue", "rating")
+    review_count = _pop_first(data, "reviewCount", "review_count")
+    schema = _base(schema_type, data)
+    if brand:
+        schema["brand"] = _entity(brand, "Brand")
+    if price is not None and "offers" not in schema:
+        offer = {"@type": "Offer", "price": str(price), "priceCurrency": currency}
+        if availability:
+            offer["availability"] = availability if "://" in availability else f"{SCHEMA_CONTEXT}/{availability}"
+        schema["offers"] = offer
+    if rating is not None and "aggregateRating" not in schema:
+        schema["aggregateRating"] = {"@type": "AggregateRating", "ratingValue": rating, "reviewCount": review_count or 1}
+    return schema
+
+
+def _organization(schema_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    address = _pop_first(data, "address")
+    same_as = _pop_first(data, "sameAs", "social_profiles", "socials")
+    schema = _base(schema_type, data)
+    if address:
+        schema["address"] = {"@type": "PostalAddress", "streetAddress": address} if isinstance(address, str) else address
+    if same_as:
+        schema["sameAs"] = same_as if isinstance(same_as, list) else [same_as]
+    return schema
+
+
+def _website(schema_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    search_url = _pop_first(data, "search_url", "searchUrl")
+    schema = _base(schema_type, data)
+    if search_url:
+        schema["potentialAction"] = {
+            "@type": "SearchAction",
+            "target": search_url,
+            "query-input": "required name=search_term_string"
+        }
+    return schema
+
+
+def _event(schema_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    location = _pop_first(data, "location")
+    start = _pop_first(data, "startDate", "start_date", "date")
+    schema = _base(schema_type, data)
+    if location:
+        schema["location"] = _entity(location, "Place")
+    if start:
+        schema["startDate"] = start
+    return schema
+
+
+def _flat(schema_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    return _base(schema_type, data)
+
+
+# schema_type -> builder(schema_type, data); anything else goes to the LLM
+SCHEMA_BUILDERS: Dict[str, Callable[[str, Dict[str, Any]], Dict[str, Any]]] = {
+    "Article": _article,
+    "BlogPosting": _article,
+    "NewsArticle": _article,
+    "FAQPage": _faq_page,
+    "HowTo": _how_to,
+    "BreadcrumbList": _breadcrumb_list,
+    "Product": _product,
+    "Organization": _organization,
+    "LocalBusiness": _organization,
+    "WebSite": _website,
+    "Event": _event,
+    "Person": _flat,
+    "WebPage": _flat,
+    "Recipe": _flat,
+    "VideoObject": _flat,
+    "Review": _flat,
+    "Course": _flat,
+}
+
+
+def build_schema(schema_type: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Build JSON-LD for a registered schema type, or None if it needs the LLM"""
+    builder = SCHEMA_BUILDERS.get(schema_type)
+    if builder is None:
+        return None
+    return builder(schema_type, dict(data))
@@ -9,7 +9,7 @@ import logging
 from bs4 import BeautifulSoup
 
 from app.core.config import settings
-from openai import AsyncOpenAI
+from app.core.openai_client import get_openai_client
 import json
 from app.core.database import save_to_db
 from app.services.external_apis import external_apis
@@ -37,6 +37,9 @@ DEFAULT_HEADERS = {
     "DNT": "1"
 }
 
+# Bot-wall markers looked for in the first 2000 characters of a crawled page
+BLOCKED_KEYWORDS = ("captcha", "robot", "automated access", "security challenge", "human or not", "suspicious activity")
+
 class SEOAuditorService:
     """Comprehensive SEO auditing service"""
     
@@ -49,7 +52,7 @@ class SEOAuditorService:
     def client(self):
         """Lazy initialization of OpenAI client"""
         if self._client is None and settings.OPENAI_API_KEY:
-            self._client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+            self._client = get_openai_client()
         return self._client
     
     async def full_audit(self, url: str, depth: int = 10) -> Dict[str, Any]:
@@ -173,14 +176,18 @@ class SEOAuditorService:
             domain = url.replace("https://", "").replace("http://", "").split("/")[0]
             query = f"site:{url}"
             
-            with DDGS() as ddgs:
-                results = ddgs.text(query, region='in-en', max_results=1)
-                if results:
-                    first = results[0]
-                    return {
-                        "title": first.get("title"),
-                        "description": first.get("body")
-                    }
+            def search():
+                with DDGS() as ddgs:
+                    return list(ddgs.text(query, region='in-en', max_results=1))
+            
+            # DDGS blocks; keep the event loop free for the rest of the audit
+            results = await asyncio.to_thread(search)
+            if results:
+                first = results[0]
+                return {
+                    "title": first.get("title"),
+                    "description": first.get("body")
+                }
         except Exception as e:
             logger.warning(f"Search metadata fallback failed: {e}")
         return None
@@ -217,11 +224,10 @@ class SEOAuditorService:
                         fc_metadata = scrape_data.get("metadata", {})
                         
                         # Use same block detection as basic crawl
-                        blocked_keywords = ["captcha", "robot", "automated access", "security challenge", "human or not", "suspicious activity"]
-                        html_lower = html.lower()[:2000]
+                        html_lower = html[:2000].lower()
                         is_blocked = (
                             len(html) < 800 or
-                            any(kw in html_lower for kw in blocked_keywords)
+                            any(kw in html_lower for kw in BLOCKED_KEYWORDS)
                         )
                         
                         # Use our robust processor with Firecrawl metadata
@@ -249,12 +255,11 @@ class SEOAuditorService:
                 # Detect blocked/empty responses
                 # Amazon and some sites return 202 or empty HTML when blocking bots
                 # Use more diverse keywords for detection
-                blocked_keywords = ["captcha", "robot", "automated access", "security challenge", "human or not", "suspicious activity"]
-                html_lower = html.lower()[:2000]
+                html_lower = html[:2000].lower()
                 is_blocked = (
                     response.status_code in [202, 403, 429, 503] or
                     len(html) < 800 or
-                    any(kw in html_lower for kw in blocked_keywords)
+                    any(kw in html_lower for kw in BLOCKED_KEYWORDS)
                 )
                 
                 if is_blocked:
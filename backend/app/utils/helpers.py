@@ -7,29 +7,103 @@ import json
 from typing import Dict, Any, List, Optional
 from urllib.parse import urlparse
 import hashlib
+import orjson
+
+# Markdown code block, optionally tagged json
+_CODE_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.DOTALL)
 
 
 def extract_json(text: str) -> Any:
     """Extract and parse JSON from text, handling markdown blocks"""
     try:
         # Quick attempt
-        return json.loads(text)
-    except json.JSONDecodeError:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
         pass
     
     # Remove markdown code blocks
-    pattern = r"```(?:json)?\s*(.*?)\s*```"
-    match = re.search(pattern, text, re.DOTALL)
+    match = _CODE_FENCE_RE.search(text)
     if match:
         try:
-            return json.loads(match.group(1))
-        except json.JSONDecodeError:
+            return orjson.loads(match.group(1))
+        except orjson.JSONDecodeError:
             pass
             
     # Raise error if still fails
     raise json.JSONDecodeError("Could not extract JSON from text", text, 0)
 
 
+class JSONObjectStream:
+    """
+    Incrementally parse a streamed JSON object.
+    feed() takes text deltas and returns the (key, value) pairs of any
+    top-level members that completed in that delta.
+    """
+
+    def __init__(self):
+        self._buf = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member_start: Optional[int] = None
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far"""
+        return self._buf
+
+    def feed(self, delta: str) -> List[tuple]:
+        if not delta:
+            return []
+        self._buf += delta
+        members = []
+        buf = self._buf
+        for i in range(self._pos, len(buf)):
+            ch = buf[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+                if self._depth == 1 and ch == "{":
+                    self._member_start = i + 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    members.extend(self._member(i))
+                    self._member_start = None
+            elif ch == "," and self._depth == 1:
+                members.extend(self._member(i))
+                self._member_start = i + 1
+        self._pos = len(buf)
+        return members
+
+    def _member(self, end: int) -> List[tuple]:
+        if self._member_start is None:
+            return []
+        fragment = self._buf[self._member_start:end].strip()
+        if not fragment:
+            return []
+        try:
+            return list(json.loads("{" + fragment + "}").items())
+        except json.JSONDecodeError:
+            return []
+
+
+def format_sse(event: str, data: Any) -> bytes:
+    """Encode one server-sent event with a JSON payload"""
+    return b"event: %s\ndata: %s\n\n" % (
+        event.encode(), orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+    )
+
+
 def normalize_url(url: str) -> str:
     """Normalize URL for consistent processing"""
     url = url.strip().lower()
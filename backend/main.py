@@ -5,12 +5,17 @@ Production-grade backend for comprehensive marketing intelligence
 
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from contextlib import asynccontextmanager
 import time
 import logging
 
 from app.core.config import settings
+from app.core.openai_client import close_openai_client, get_openai_client
+from app.services.competitive_intel import competitive_intel_service
+from app.services.content_engine import content_engine_service
+from app.services.external_apis import external_apis
+from app.services.api_cache import close_api_cache
 from app.api.routes import (
     ai_visibility,
     seo_audit,
@@ -38,8 +43,16 @@ async def lifespan(app: FastAPI):
     """Application lifespan events"""
     logger.info("🚀 Starting SEO Intelligence Platform...")
     logger.info(f"📊 Version: {settings.APP_VERSION}")
+    # Open the shared OpenAI connection pool on the app's event loop before the first request
+    get_openai_client()
     yield
     logger.info("👋 Shutting down SEO Intelligence Platform...")
+    await analytics.analytics_service.aclose()
+    await competitive_intel_service.aclose()
+    await content_engine_service.aclose()
+    await external_apis.aclose()
+    await close_api_cache()
+    await close_openai_client()
 
 
 # Initialize FastAPI application
@@ -60,6 +73,7 @@ app = FastAPI(
     - **Autonomous Agents** - Automated SEO workflows and monitoring
     """,
     version=settings.APP_VERSION,
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc",
     lifespan=lifespan